@@ -0,0 +1,11 @@
+"""Reproducible scramble corpora for the benchmarks."""
+
+from game.scramble import scrambles
+
+
+def corpus(size, seed=0, length=25, mode="moves"):
+    """
+    :return: A list of size cube_str, the same for the same seed
+    (see game.scramble.scrambles)
+    """
+    return list(scrambles(size, seed=seed, mode=mode, length=length))
@@ -0,0 +1,197 @@
+"""Benchmarks of the cube operations and of full solves.
+
+Run all benchmarks and write the results as JSON:
+
+    python -m benchmarks.run --output results.json
+
+Compare the results of two runs, e.g. of two commits:
+
+    python -m benchmarks.run --compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from collections import Counter
+
+from benchmarks.corpus import corpus
+from constants import ROT_XY_CW
+from game.cube import Cube
+from game.piece import Piece
+from game.point import Point
+from solving_methods.solver import STAGES, Solver
+
+CUBE_MOVES = tuple(
+    face + suffix for face in "LRUDFBMESXYZ" for suffix in ("", "i")
+)
+
+
+def _time(function, number, repeat):
+    """:return: Best and median time of a single call in microseconds"""
+    times = timeit.repeat(function, number=number, repeat=repeat)
+    return {
+        "best_us": min(times) / number * 1e6,
+        "median_us": statistics.median(times) / number * 1e6,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def micro_benchmarks(cube_str, number=1000, repeat=5):
+    """
+    :return: A dict mapping the name of every benchmark to its timing
+    """
+    cube = Cube(cube_str)
+    corner = cube.get_piece(1, 1, 1)
+    corner_colors = [c for c in corner.colors if c is not None]
+    piece = Piece(position=Point(1, 1, 1), colors=("R", "U", "F"))
+    a, b = Point(1, 0, -1), Point(0, 1, 1)
+
+    benchmarks = {f"Cube.{name}": getattr(cube, name) for name in CUBE_MOVES}
+    benchmarks.update(
+        {
+            "Cube.sequence": lambda: cube.sequence("Ri B B R Bi Bi D Bi Di"),
+            "Cube.find_piece": lambda: cube.find_piece(*corner_colors),
+            "Cube.get_piece": lambda: cube.get_piece(1, 1, 1),
+            "Cube.is_solved": cube.is_solved,
+            "Cube.flat_str": cube.flat_str,
+            "Cube.key": cube.key,
+            "Cube.copy": cube.copy,
+            "Piece.rotate": lambda: piece.rotate(ROT_XY_CW),
+            "Matrix.__mul__": lambda: ROT_XY_CW * a,
+            "Point.__add__": lambda: a + b,
+            "Point.__sub__": lambda: a - b,
+            "Point.__mul__": lambda: a * 2,
+            "Point.dot": lambda: a.dot(b),
+            "Point.cross": lambda: a.cross(b),
+        }
+    )
+    return {
+        name: _time(function, number, repeat)
+        for name, function in benchmarks.items()
+    }
+
+
+def _distribution(values):
+    values = sorted(values)
+    return {
+        "min": values[0],
+        "max": values[-1],
+        "mean": statistics.mean(values),
+        "median": statistics.median(values),
+        "p90": values[int(0.9 * (len(values) - 1))],
+        "histogram": {
+            f"{low}-{low + 9}": count
+            for low, count in sorted(
+                Counter(v // 10 * 10 for v in values).items()
+            )
+        },
+    }
+
+
+def solve_benchmark(cube_strs):
+    """
+    Solve every cube of the corpus with Solver.
+
+    :return: Throughput, distribution of the solution lengths and the time
+    spent in every stage
+    """
+    lengths = []
+    stage_times = dict.fromkeys((name for name, _ in STAGES), 0.0)
+    start = time.perf_counter()
+    for cube_str in cube_strs:
+        solver = Solver(Cube(cube_str))
+        solver.solve()
+        lengths.append(len(solver.moves))
+        for stage in solver.stats.stages:
+            stage_times[stage.name] += stage.wall_time
+    seconds = time.perf_counter() - start
+    return {
+        "cubes": len(cube_strs),
+        "seconds": seconds,
+        "cubes_per_second": len(cube_strs) / seconds,
+        "moves": _distribution(lengths),
+        "stage_seconds": stage_times,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(seed=0, solves=100, number=1000, repeat=5):
+    """:return: The results of all benchmarks as a JSON serializable dict"""
+    cube_strs = corpus(solves, seed)
+    return {
+        "meta": {
+            "commit": _commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+        },
+        "micro": micro_benchmarks(cube_strs[0], number, repeat),
+        "solve": solve_benchmark(cube_strs),
+    }
+
+
+def compare(before, after):
+    """:return: Lines comparing the results of two runs"""
+    lines = [f"{'benchmark':<24}{'before':>12}{'after':>12}{'ratio':>8}"]
+    for name, timing in after["micro"].items():
+        if name not in before["micro"]:
+            continue
+        old, new = before["micro"][name]["best_us"], timing["best_us"]
+        lines.append(
+            f"{name:<24}{old:>10.2f}us{new:>10.2f}us{new / old:>8.2f}"
+        )
+    old = before["solve"]["cubes_per_second"]
+    new = after["solve"]["cubes_per_second"]
+    lines.append(
+        f"{'solves per second':<24}{old:>12.1f}{new:>12.1f}{new / old:>8.2f}"
+    )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="JSON file, stdout if not given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--solves", type=int, default=100, help="size of the corpus"
+    )
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="JSON files"
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.load(open(path)) for path in args.compare)
+        print("\n".join(compare(before, after)))
+        return
+
+    results = run(args.seed, args.solves, args.number, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
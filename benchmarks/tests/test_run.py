@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.corpus import corpus
+from benchmarks.run import compare
+from benchmarks.run import main
+from benchmarks.run import run
+from game.cube import Cube
+
+
+def test_corpus_is_reproducible():
+    assert corpus(3, seed=1) == corpus(3, seed=1)
+    assert corpus(3, seed=1) != corpus(3, seed=2)
+    assert not any(Cube(cube_str).is_solved() for cube_str in corpus(3))
+
+
+def test_run_and_compare(tmp_path):
+    results = run(seed=0, solves=2, number=1, repeat=1)
+    json.dumps(results)
+    assert "Cube.R" in results["micro"]
+    assert "Point.cross" in results["micro"]
+    assert results["solve"]["cubes"] == 2
+    assert len(compare(results, results)) == len(results["micro"]) + 2
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "results.json"
+    main(
+        [
+            "--output",
+            str(output),
+            "--solves",
+            "1",
+            "--number",
+            "1",
+            "--repeat",
+            "1",
+        ]
+    )
+    assert json.loads(output.read_text())["solve"]["cubes"] == 1
@@ -31,3 +31,8 @@ def solved_cube_str():
 @pytest.fixture
 def solved_cube(solved_cube_str):
     return Cube(solved_cube_str)
+
+
+@pytest.fixture(scope="session")
+def table_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("tables")
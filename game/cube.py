@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import string
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple, Union, Optional, List
 
 from constants import (
@@ -24,8 +25,53 @@ from constants import (
     Y_AXIS,
     Z_AXIS,
 )
+from game.facelet_cube import FACELET_AXES, FACELET_POSITIONS
 from game.piece import Piece
-from game.point import Point
+from game.point import POSITIONS
+from game.sequence import compile_sequence
+
+# The position and axis of every sticker in the cube_str order
+_FACELETS = tuple(
+    (tuple(position), axis)
+    for position, axis in zip(FACELET_POSITIONS, FACELET_AXES)
+)
+# The position and axis of the centers of RIGHT, LEFT, UP, DOWN, FRONT, BACK
+_CENTERS = (
+    ((1, 0, 0), 0),
+    ((-1, 0, 0), 0),
+    ((0, 1, 0), 1),
+    ((0, -1, 0), 1),
+    ((0, 0, 1), 2),
+    ((0, 0, -1), 2),
+)
+# The positions of the pieces on each face, by the direction of the face
+_FACES = {
+    xyz: tuple(
+        position for position in POSITIONS if position[axis] == xyz[axis]
+    )
+    for xyz, axis in _CENTERS
+}
+
+
+@lru_cache(maxsize=None)
+def _solved_colors(center_colors):
+    """
+    :param center_colors: The colors of the centers in the order of _CENTERS
+    :return: A dict mapping each position to the colors of the piece that
+    belongs there, given the centers
+    """
+    face_colors = dict(zip((xyz for xyz, _ in _CENTERS), center_colors))
+    solved = {}
+    for xyz in POSITIONS:
+        solved[xyz] = [
+            (
+                face_colors[tuple(v if i == axis else 0 for i in range(3))]
+                if v
+                else None
+            )
+            for axis, v in enumerate(xyz)
+        ]
+    return solved
 
 
 @dataclass
@@ -71,6 +117,7 @@ class Cube:
         self._set_corners()
         self._set_pieces()
         self._assert_data()
+        self._index_pieces()
 
     def _set_faces(self):
         self.faces = (
@@ -207,41 +254,118 @@ class Cube:
         assert all(p.type == EDGE for p in self.edges)
         assert all(p.type == CORNER for p in self.corners)
 
+    def _index_pieces(self):
+        """
+        Index the pieces by position and by their set of colors.
+        The colors of a piece never change, the positions are updated
+        by every rotation.
+        """
+        self._pieces_by_position = {tuple(p.position): p for p in self.pieces}
+        self._pieces_by_colors = {}
+        for p in self.pieces:
+            colors = [c for c in p.colors if c is not None]
+            self._pieces_by_colors.setdefault(
+                (len(colors), frozenset(colors)), p
+            )
+        self._misplaced = None
+
+    def _track_solved(self):
+        """
+        Find the positions of all pieces whose colors do not match the
+        centers. Moves and sequences keep the result up to date, other
+        changes reset it to None, so that it is found again on the next
+        is_solved.
+        """
+        solved = self._find_solved_colors()
+        self._misplaced = {
+            xyz
+            for xyz, p in self._pieces_by_position.items()
+            if p.colors != solved[xyz]
+        }
+
+    def _find_solved_colors(self):
+        """:return: The colors of the solved pieces given the centers"""
+        by_position = self._pieces_by_position
+        self._solved_colors = _solved_colors(
+            tuple(by_position[xyz].colors[axis] for xyz, axis in _CENTERS)
+        )
+        return self._solved_colors
+
     def _from_cube(self, c):
         self.faces = [
-            Piece(position=Point(p.position), colors=p.colors) for p in c.faces
+            Piece(position=p.position, colors=p.colors) for p in c.faces
         ]
         self.edges = [
-            Piece(position=Point(p.position), colors=p.colors) for p in c.edges
+            Piece(position=p.position, colors=p.colors) for p in c.edges
         ]
         self.corners = [
-            Piece(position=Point(p.position), colors=p.colors)
-            for p in c.corners
+            Piece(position=p.position, colors=p.colors) for p in c.corners
         ]
         self.pieces = self.faces + self.edges + self.corners
         self._assert_data()
+        self._index_pieces()
 
-    def is_solved(self):
-        def check(colors):
-            assert len(colors) == 9
-            return all(c == colors[0] for c in colors)
+    def copy(self):
+        """
+        :return: An independent copy of the cube. Unlike Cube(cube) the
+        pieces are copied without being validated again.
+        """
+        clone = object.__new__(Cube)
+        clone.cube_str = self.cube_str
+        copies = {id(p): p.copy() for p in self.pieces}
+        clone.faces = [copies[id(p)] for p in self.faces]
+        clone.edges = [copies[id(p)] for p in self.edges]
+        clone.corners = [copies[id(p)] for p in self.corners]
+        clone.pieces = clone.faces + clone.edges + clone.corners
+        clone._pieces_by_position = {
+            position: copies[id(p)]
+            for position, p in self._pieces_by_position.items()
+        }
+        clone._pieces_by_colors = {
+            colors: copies[id(p)]
+            for colors, p in self._pieces_by_colors.items()
+        }
+        clone._misplaced = None
+        if self._misplaced is not None:
+            clone._solved_colors = self._solved_colors
+            clone._misplaced = set(self._misplaced)
+        return clone
+
+    def snapshot(self):
+        """
+        :return: The current state, which restore() brings back. Unlike a
+        copy the snapshot keeps no pieces, only their positions and colors.
+        """
+        return tuple((p.position, tuple(p.colors)) for p in self.pieces)
 
-        return (
-            check([piece.colors[2] for piece in self._face(FRONT)])
-            and check([piece.colors[2] for piece in self._face(BACK)])
-            and check([piece.colors[1] for piece in self._face(UP)])
-            and check([piece.colors[1] for piece in self._face(DOWN)])
-            and check([piece.colors[0] for piece in self._face(LEFT)])
-            and check([piece.colors[0] for piece in self._face(RIGHT)])
-        )
+    def restore(self, snapshot):
+        """
+        Bring the cube back to a state returned by snapshot() of this cube.
+        The pieces stay the same objects, so references to them remain
+        valid.
+        """
+        for piece, (position, colors) in zip(self.pieces, snapshot):
+            piece.position = position
+            piece.colors = list(colors)
+        self._pieces_by_position = {tuple(p.position): p for p in self.pieces}
+        self._misplaced = None
+
+    def is_solved(self):
+        """
+        Every face has a single color. The misplaced pieces are tracked by
+        the face moves, so after those this is a constant time check.
+        """
+        if self._misplaced is None:
+            self._track_solved()
+        return not self._misplaced
 
     def _face(self, axis):
         """
         :param axis: One of FRONT, BACK, UP, DOWN, LEFT, RIGHT
         :return: A list of Pieces on the given face
         """
-        assert axis.count(0) == 2
-        return [p for p in self.pieces if p.position.dot(axis) > 0]
+        by_position = self._pieces_by_position
+        return [by_position[xyz] for xyz in _FACES[axis.x, axis.y, axis.z]]
 
     def _slice(self, plane):
         """
@@ -254,15 +378,31 @@ class Cube:
         return [p for p in self.pieces if p.position[i] == 0]
 
     def _rotate_face(self, face, matrix):
-        self._rotate_pieces(self._face(face), matrix)
+        self._rotate_pieces(self._face(face), matrix, centers_move=False)
 
     def _rotate_slice(self, plane, matrix):
         self._rotate_pieces(self._slice(plane), matrix)
 
-    @staticmethod
-    def _rotate_pieces(pieces, matrix):
+    def _rotate_pieces(self, pieces, matrix, centers_move=True):
+        """
+        :param centers_move: False if the centers stay where they are, then
+        only the rotated pieces can become misplaced or placed
+        """
+        by_position = self._pieces_by_position
+        misplaced = None if centers_move else self._misplaced
         for piece in pieces:
             piece.rotate(matrix)
+            p = piece.position
+            position = p.x, p.y, p.z
+            by_position[position] = piece
+            if misplaced is None:
+                continue
+            if piece.colors == self._solved_colors[position]:
+                misplaced.discard(position)
+            else:
+                misplaced.add(position)
+        if centers_move:
+            self._misplaced = None
 
     def L(self):
         self._rotate_face(LEFT, ROT_YZ_CC)
@@ -342,27 +482,18 @@ class Cube:
         :param moves: A string containing notated moves separated by spaces:
         "L Ri U M Ui B M"
         """
-        moves = [getattr(self, name) for name in move_str.split()]
-        for move in moves:
-            move()
+        compile_sequence(move_str).apply(self)
 
     def find_piece(self, *colors):
         if None in colors:
             return
-        for p in self.pieces:
-            if p.colors.count(None) == 3 - len(colors) and all(
-                c in p.colors for c in colors
-            ):
-                return p
+        return self._pieces_by_colors.get((len(colors), frozenset(colors)))
 
     def get_piece(self, x, y, z):
         """
         :return: the Piece at the given Point
         """
-        point = Point(x, y, z)
-        for p in self.pieces:
-            if p.position == point:
-                return p
+        return self._pieces_by_position.get((x, y, z))
 
     def __getitem__(self, *args):
         if len(args) == 1:
@@ -370,10 +501,24 @@ class Cube:
         return self.get_piece(*args)
 
     def __eq__(self, other):
-        return (
-            isinstance(other, Cube)
-            and self._color_list() == other._color_list()
-        )
+        return isinstance(other, Cube) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        """
+        :return: The colors of the 54 stickers in the cube_str order as
+        bytes. Equal cubes have equal keys. The key changes with every
+        move, so don't move a cube while it is used in a set or dict.
+        """
+        by_position = self._pieces_by_position
+        return "".join(
+            [
+                by_position[position].colors[axis]
+                for position, axis in _FACELETS
+            ]
+        ).encode()
 
     def __ne__(self, other):
         return not (self == other)
@@ -0,0 +1,111 @@
+import numpy as np
+
+from game.facelet_cube import FACE_FACELETS
+from game.sequence import CompiledSequence, compile_sequence
+
+# The facelets of every face, the center first
+_FACES = np.array(
+    [
+        (facelets[4],) + facelets[:4] + facelets[5:]
+        for facelets in FACE_FACELETS.values()
+    ],
+    dtype=np.intp,
+)
+
+# Multipliers of the row hash, fixed so hashes are equal across processes
+_HASH_MULTIPLIERS = np.random.default_rng(0x5EED).integers(
+    1, 2**63, size=7, dtype=np.uint64
+) | np.uint64(1)
+
+
+class CubeBatch:
+    """N cubes stored as an (N, 54) uint8 array.
+
+    Every row holds the stickers of one cube in the cube_str order (see
+    Cube.__post_init__), each sticker as the byte of its color character.
+    A move or a whole sequence is a single gather of the columns, applied
+    to all cubes at once.
+    """
+
+    def __init__(self, states):
+        """
+        :param states: An (N, 54) array of color bytes, or an iterable of
+        cube_str strings, Cubes or FaceletCubes
+        """
+        if not isinstance(states, np.ndarray):
+            states = [
+                s if isinstance(s, str) else s.flat_str() for s in states
+            ]
+            states = np.frombuffer(
+                "".join(states).encode("ascii"), dtype=np.uint8
+            ).reshape(len(states), 54)
+        if states.ndim != 2 or states.shape[1] != 54:
+            raise ValueError(f"Expected shape (N, 54), got {states.shape}")
+        self.states = np.array(states, dtype=np.uint8)
+
+    @classmethod
+    def repeat(cls, cube, n):
+        """:return: A batch of n copies of cube"""
+        return cls(np.tile(cls([cube]).states, (n, 1)))
+
+    def __len__(self):
+        return len(self.states)
+
+    def __getitem__(self, item):
+        """
+        :return: The cube_str of a single cube, or a CubeBatch for a slice
+        or an index array
+        """
+        if isinstance(item, (int, np.integer)):
+            return self.states[item].tobytes().decode("ascii")
+        return CubeBatch(self.states[item])
+
+    def cube_strs(self):
+        return [row.tobytes().decode("ascii") for row in self.states]
+
+    def copy(self):
+        return CubeBatch(self.states)
+
+    def sequence(self, move_str):
+        """
+        Apply the moves to every cube.
+
+        :param move_str: A string containing notated moves separated by
+        spaces: "L Ri U M Ui B M", or a CompiledSequence
+        """
+        if not isinstance(move_str, CompiledSequence):
+            move_str = compile_sequence(move_str)
+        self.states = self.states[:, move_str.permutation]
+
+    def is_solved(self):
+        """:return: A bool array, True for every solved cube"""
+        faces = self.states[:, _FACES]
+        return (faces == faces[:, :, :1]).all(axis=(1, 2))
+
+    def equals(self, other):
+        """
+        :param other: A CubeBatch of the same length or a single cube
+        :return: A bool array, True where the cubes are equal
+        """
+        if not isinstance(other, CubeBatch):
+            other = CubeBatch([other])
+        return (self.states == other.states).all(axis=1)
+
+    def hashes(self):
+        """:return: A uint64 array with a hash of every cube"""
+        words = np.zeros((len(self.states), 56), dtype=np.uint8)
+        words[:, :54] = self.states
+        words = words.view(np.uint64)
+        hashes = np.zeros(len(self.states), dtype=np.uint64)
+        for i in range(words.shape[1]):
+            hashes = (hashes ^ words[:, i]) * _HASH_MULTIPLIERS[i]
+            hashes ^= hashes >> np.uint64(29)
+        return hashes
+
+    def unique(self):
+        """
+        :return: A CubeBatch without duplicates, and for every cube of
+        this batch the index of its cube in the returned batch
+        """
+        states, inverse = np.unique(self.states, axis=0, return_inverse=True)
+        return CubeBatch(states), inverse.reshape(-1)
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import string
+from dataclasses import dataclass
+from math import factorial
+from typing import Tuple, Union, Optional, Dict
+
+from constants import RIGHT, LEFT, UP, DOWN, FRONT, BACK
+from game.cube import Cube
+from game.facelet_cube import MOVE_PERMUTATIONS, facelet_index
+
+# Face names in the order of the coordinates, with direction and axis.
+FACES = "URFDLB"
+_FACE_VECTORS = {
+    "U": (UP, 1),
+    "R": (RIGHT, 0),
+    "F": (FRONT, 2),
+    "D": (DOWN, 1),
+    "L": (LEFT, 0),
+    "B": (BACK, 2),
+}
+
+# Corners and edges in the order used for the coordinates. The faces of a
+# corner are listed clockwise, starting with the UP or DOWN face.
+CORNERS = ("URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB")
+EDGES = (
+    "UR",
+    "UF",
+    "UL",
+    "UB",
+    "DR",
+    "DF",
+    "DL",
+    "DB",
+    "FR",
+    "FL",
+    "BL",
+    "BR",
+)
+
+# The 12 face turns. Slice moves and whole cube rotations move the centers,
+# so they have no cubie representation.
+FACE_MOVES = ("U", "Ui", "R", "Ri", "F", "Fi", "D", "Di", "L", "Li", "B", "Bi")
+
+
+def _facelets(name):
+    """
+    :param name: Faces of a piece, e.g. "URF"
+    :return: The indices of its stickers in the cube_str layout
+    """
+    position = _FACE_VECTORS[name[0]][0]
+    for face in name[1:]:
+        position = position + _FACE_VECTORS[face][0]
+    return tuple(facelet_index(position, _FACE_VECTORS[f][1]) for f in name)
+
+
+CENTER_FACELETS = {face: _facelets(face)[0] for face in FACES}
+CORNER_FACELETS = tuple(_facelets(name) for name in CORNERS)
+EDGE_FACELETS = tuple(_facelets(name) for name in EDGES)
+
+N_CORNER_PERMUTATION = factorial(8)
+N_CORNER_ORIENTATION = 3**7
+N_EDGE_PERMUTATION = factorial(12)
+N_EDGE_ORIENTATION = 2**11
+
+
+def center_colors(cube_str):
+    """
+    :return: A dict mapping each face name in FACES to the color of its
+    center sticker in cube_str
+    """
+    return {face: cube_str[i] for face, i in CENTER_FACELETS.items()}
+
+
+def permutation_rank(perm):
+    """
+    :return: The position of perm in the lexicographic order of all
+    permutations of its items, 0 for the identity
+    """
+    n = len(perm)
+    rank = 0
+    for i in range(n - 1):
+        smaller = sum(1 for j in range(i + 1, n) if perm[j] < perm[i])
+        rank += smaller * factorial(n - 1 - i)
+    return rank
+
+
+def permutation_unrank(rank, n):
+    """
+    :return: The permutation of range(n) at position rank in the
+    lexicographic order, inverse of permutation_rank
+    """
+    items = list(range(n))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        index, rank = divmod(rank, factorial(i))
+        perm.append(items.pop(index))
+    return tuple(perm)
+
+
+def permutation_parity(perm):
+    """
+    :return: 0 for an even and 1 for an odd permutation
+    """
+    # A cycle of length k is k - 1 transpositions
+    seen = [False] * len(perm)
+    cycles = 0
+    for i in range(len(perm)):
+        if not seen[i]:
+            cycles += 1
+            while not seen[i]:
+                seen[i] = True
+                i = perm[i]
+    return (len(perm) - cycles) % 2
+
+
+def _orientation_coordinate(orientation, base):
+    coordinate = 0
+    for o in orientation[:-1]:
+        coordinate = coordinate * base + o
+    return coordinate
+
+
+def _orientation_from_coordinate(coordinate, base, n):
+    orientation = []
+    for _ in range(n - 1):
+        coordinate, o = divmod(coordinate, base)
+        orientation.append(o)
+    orientation.reverse()
+    orientation.append(-sum(orientation) % base)
+    return tuple(orientation)
+
+
+@dataclass
+class CubieCube:
+    """Stores a cube position on the cubie level:
+    cp[i] is the corner at corner position i, co[i] its orientation (0..2),
+    ep[i] is the edge at edge position i, eo[i] its orientation (0..1).
+    Positions and pieces are numbered as in CORNERS and EDGES.
+
+    The centers are not part of the state, they are assumed to be in
+    their home position.
+    """
+
+    cp: Tuple[int, ...] = tuple(range(8))
+    co: Tuple[int, ...] = (0,) * 8
+    ep: Tuple[int, ...] = tuple(range(12))
+    eo: Tuple[int, ...] = (0,) * 12
+
+    def __post_init__(self):
+        self.cp = tuple(self.cp)
+        self.co = tuple(self.co)
+        self.ep = tuple(self.ep)
+        self.eo = tuple(self.eo)
+
+    @classmethod
+    def from_cube_str(cls, cube_str: str) -> CubieCube:
+        """
+        :param cube_str: Stickers in the layout of Cube.__post_init__.
+        The faces are identified by the colors of the centers.
+        """
+        cube_str = "".join(x for x in cube_str if x not in string.whitespace)
+        assert len(cube_str) == 54
+        faces = {
+            color: face for face, color in center_colors(cube_str).items()
+        }
+        if len(faces) != 6:
+            raise ValueError(f"Centers must have 6 colors: {cube_str}")
+        try:
+            stickers = [faces[color] for color in cube_str]
+        except KeyError as e:
+            raise ValueError(f"Color {e.args[0]} is not on any center")
+
+        cp, co = [], []
+        for facelets in CORNER_FACELETS:
+            colors = [stickers[f] for f in facelets]
+            for o in range(3):
+                if colors[o] in "UD":
+                    break
+            else:
+                raise ValueError(f"Invalid corner: {''.join(colors)}")
+            colors = colors[o:] + colors[:o]
+            corner = "".join(colors)
+            if corner not in CORNERS:
+                raise ValueError(f"Invalid corner: {corner}")
+            cp.append(CORNERS.index(corner))
+            co.append(o)
+
+        ep, eo = [], []
+        for facelets in EDGE_FACELETS:
+            edge = "".join(stickers[f] for f in facelets)
+            if edge in EDGES:
+                ep.append(EDGES.index(edge))
+                eo.append(0)
+            elif edge[::-1] in EDGES:
+                ep.append(EDGES.index(edge[::-1]))
+                eo.append(1)
+            else:
+                raise ValueError(f"Invalid edge: {edge}")
+        return cls(cp, co, ep, eo)
+
+    @classmethod
+    def from_cube(cls, cube) -> CubieCube:
+        """
+        :param cube: A Cube or FaceletCube
+        """
+        return cls.from_cube_str(cube.flat_str())
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        corner_permutation,
+        corner_orientation,
+        edge_permutation,
+        edge_orientation,
+    ) -> CubieCube:
+        return cls(
+            permutation_unrank(corner_permutation, 8),
+            _orientation_from_coordinate(corner_orientation, 3, 8),
+            permutation_unrank(edge_permutation, 12),
+            _orientation_from_coordinate(edge_orientation, 2, 12),
+        )
+
+    def to_cube_str(
+        self, colors: Optional[Union[str, Dict[str, str]]] = None
+    ) -> str:
+        """
+        :param colors: The color of each face, either a dict as returned by
+        center_colors or a string in the order of FACES.
+        Defaults to the face names.
+        """
+        if colors is None:
+            colors = FACES
+        if isinstance(colors, str):
+            colors = dict(zip(FACES, colors))
+        stickers = [None] * 54
+        for face, f in CENTER_FACELETS.items():
+            stickers[f] = colors[face]
+        for i, facelets in enumerate(CORNER_FACELETS):
+            corner, o = CORNERS[self.cp[i]], self.co[i]
+            for k, f in enumerate(facelets):
+                stickers[f] = colors[corner[(k - o) % 3]]
+        for i, facelets in enumerate(EDGE_FACELETS):
+            edge, o = EDGES[self.ep[i]], self.eo[i]
+            for k, f in enumerate(facelets):
+                stickers[f] = colors[edge[(k + o) % 2]]
+        return "".join(stickers)
+
+    def to_cube(self, colors=None) -> Cube:
+        return Cube(self.to_cube_str(colors))
+
+    @property
+    def corner_permutation(self) -> int:
+        """0 <= corner_permutation < 8! = 40320"""
+        return permutation_rank(self.cp)
+
+    @property
+    def corner_orientation(self) -> int:
+        """0 <= corner_orientation < 3^7 = 2187"""
+        return _orientation_coordinate(self.co, 3)
+
+    @property
+    def edge_permutation(self) -> int:
+        """0 <= edge_permutation < 12! = 479001600"""
+        return permutation_rank(self.ep)
+
+    @property
+    def edge_orientation(self) -> int:
+        """0 <= edge_orientation < 2^11 = 2048"""
+        return _orientation_coordinate(self.eo, 2)
+
+    def coordinates(self) -> Tuple[int, int, int, int]:
+        """
+        :return: (corner_permutation, corner_orientation,
+        edge_permutation, edge_orientation), see from_coordinates
+        """
+        return (
+            self.corner_permutation,
+            self.corner_orientation,
+            self.edge_permutation,
+            self.edge_orientation,
+        )
+
+    def multiply(self, other: CubieCube) -> CubieCube:
+        """
+        :return: The position reached by applying the moves of other
+        to this position
+        """
+        return CubieCube(
+            tuple(self.cp[i] for i in other.cp),
+            tuple((self.co[i] + o) % 3 for i, o in zip(other.cp, other.co)),
+            tuple(self.ep[i] for i in other.ep),
+            tuple((self.eo[i] + o) % 2 for i, o in zip(other.ep, other.eo)),
+        )
+
+    def inverse(self) -> CubieCube:
+        cp = [0] * 8
+        co = [0] * 8
+        for i, (c, o) in enumerate(zip(self.cp, self.co)):
+            cp[c] = i
+            co[c] = -o % 3
+        ep = [0] * 12
+        eo = [0] * 12
+        for i, (e, o) in enumerate(zip(self.ep, self.eo)):
+            ep[e] = i
+            eo[e] = o
+        return CubieCube(cp, co, ep, eo)
+
+    def move(self, name):
+        """Apply one of FACE_MOVES."""
+        cp, co, ep, eo = MOVE_TABLES[name]
+        corners = self.cp
+        twists = self.co
+        edges = self.ep
+        flips = self.eo
+        self.cp = tuple(corners[i] for i in cp)
+        self.co = tuple((twists[i] + o) % 3 for i, o in zip(cp, co))
+        self.ep = tuple(edges[i] for i in ep)
+        self.eo = tuple((flips[i] + o) % 2 for i, o in zip(ep, eo))
+
+    def sequence(self, move_str):
+        """
+        :param move_str: Face turns separated by spaces: "L Ri U Ui B"
+        """
+        for name in move_str.split():
+            self.move(name)
+
+    def is_solved(self):
+        return self == SOLVED
+
+
+SOLVED = CubieCube()
+
+
+def _move_table(name):
+    stickers = SOLVED.to_cube_str()
+    stickers = "".join(stickers[i] for i in MOVE_PERMUTATIONS[name])
+    cube = CubieCube.from_cube_str(stickers)
+    return cube.cp, cube.co, cube.ep, cube.eo
+
+
+# For every face turn the cubie level result of the turn on a solved cube,
+# as (cp, co, ep, eo).
+MOVE_TABLES = {name: _move_table(name) for name in FACE_MOVES}
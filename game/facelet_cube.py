@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+import string
+from operator import itemgetter
+from typing import Union
+
+from constants import (
+    RIGHT,
+    LEFT,
+    UP,
+    DOWN,
+    FRONT,
+    BACK,
+    FACE,
+    EDGE,
+    CORNER,
+    ROT_XY_CW,
+    ROT_XY_CC,
+    ROT_XZ_CW,
+    ROT_XZ_CC,
+    ROT_YZ_CW,
+    ROT_YZ_CC,
+    X_AXIS,
+    Y_AXIS,
+    Z_AXIS,
+)
+from game.point import Point
+
+
+def facelet_index(position, axis):
+    """
+    :param position: Position of a Piece (any component in {-1, 0, 1})
+    :param axis: 0, 1 or 2 - the axis the sticker is facing along
+    :return: Index of the sticker in the cube_str layout
+    (see Cube.__post_init__)
+    """
+    x, y, z = position
+    if axis == 1:
+        if y == 1:
+            return (z + 1) * 3 + (x + 1)
+        return 45 + (1 - z) * 3 + (x + 1)
+    if axis == 0:
+        if x == -1:
+            return 9 + (1 - y) * 12 + (z + 1)
+        return 15 + (1 - y) * 12 + (1 - z)
+    if z == 1:
+        return 12 + (1 - y) * 12 + (x + 1)
+    return 18 + (1 - y) * 12 + (1 - x)
+
+
+# Every position of a Piece, and for every position the sticker indices
+# along the x, y and z axis (None where the Piece has no sticker).
+POSITIONS = tuple(
+    Point(x, y, z)
+    for x in (-1, 0, 1)
+    for y in (-1, 0, 1)
+    for z in (-1, 0, 1)
+    if (x, y, z) != (0, 0, 0)
+)
+SLOT_FACELETS = {
+    tuple(p): tuple(
+        facelet_index(p, axis) if p[axis] != 0 else None for axis in range(3)
+    )
+    for p in POSITIONS
+}
+
+# For every sticker index the position of its Piece and its axis.
+FACELET_POSITIONS = [None] * 54
+FACELET_AXES = [None] * 54
+for _p in POSITIONS:
+    for _axis, _f in enumerate(SLOT_FACELETS[tuple(_p)]):
+        if _f is not None:
+            FACELET_POSITIONS[_f] = _p
+            FACELET_AXES[_f] = _axis
+FACELET_POSITIONS = tuple(FACELET_POSITIONS)
+FACELET_AXES = tuple(FACELET_AXES)
+
+# The first sticker of every Piece identifies the Piece.
+FACELET_ANCHORS = tuple(
+    next(f for f in SLOT_FACELETS[tuple(p)] if f is not None)
+    for p in FACELET_POSITIONS
+)
+
+FACE_FACELETS = {
+    tuple(face): tuple(
+        sorted(
+            f
+            for f in range(54)
+            if FACELET_POSITIONS[f][FACELET_AXES[f]] == face[FACELET_AXES[f]]
+            and face[FACELET_AXES[f]] != 0
+        )
+    )
+    for face in (UP, LEFT, FRONT, RIGHT, BACK, DOWN)
+}
+
+# Layers and rotation matrices of the 24 moves, as in Cube.
+_MOVE_LAYERS = {
+    "L": (LEFT, ROT_YZ_CC),
+    "Li": (LEFT, ROT_YZ_CW),
+    "R": (RIGHT, ROT_YZ_CW),
+    "Ri": (RIGHT, ROT_YZ_CC),
+    "U": (UP, ROT_XZ_CW),
+    "Ui": (UP, ROT_XZ_CC),
+    "D": (DOWN, ROT_XZ_CC),
+    "Di": (DOWN, ROT_XZ_CW),
+    "F": (FRONT, ROT_XY_CW),
+    "Fi": (FRONT, ROT_XY_CC),
+    "B": (BACK, ROT_XY_CC),
+    "Bi": (BACK, ROT_XY_CW),
+    "M": (Y_AXIS + Z_AXIS, ROT_YZ_CC),
+    "Mi": (Y_AXIS + Z_AXIS, ROT_YZ_CW),
+    "E": (X_AXIS + Z_AXIS, ROT_XZ_CC),
+    "Ei": (X_AXIS + Z_AXIS, ROT_XZ_CW),
+    "S": (X_AXIS + Y_AXIS, ROT_XY_CW),
+    "Si": (X_AXIS + Y_AXIS, ROT_XY_CC),
+    "X": (None, ROT_YZ_CW),
+    "Xi": (None, ROT_YZ_CC),
+    "Y": (None, ROT_XZ_CW),
+    "Yi": (None, ROT_XZ_CC),
+    "Z": (None, ROT_XY_CW),
+    "Zi": (None, ROT_XY_CC),
+}
+
+
+def _in_layer(position, layer):
+    if layer is None:
+        return True
+    if layer.count(0) == 2:
+        return position.dot(layer) > 0
+    i = next(i for i, x in enumerate(layer) if x == 0)
+    return position[i] == 0
+
+
+def _move_permutation(layer, matrix):
+    """
+    :return: A tuple `perm` such that after the move the sticker at
+    index i is the sticker which was at index perm[i] before the move
+    """
+    perm = list(range(54))
+    for f in range(54):
+        position = FACELET_POSITIONS[f]
+        if not _in_layer(position, layer):
+            continue
+        axis = FACELET_AXES[f]
+        normal = [0, 0, 0]
+        normal[axis] = position[axis]
+        normal = matrix * Point(tuple(normal))
+        new_axis = next(i for i, x in enumerate(normal) if x != 0)
+        perm[facelet_index(matrix * position, new_axis)] = f
+    return tuple(perm)
+
+
+MOVE_PERMUTATIONS = {
+    name: _move_permutation(layer, matrix)
+    for name, (layer, matrix) in _MOVE_LAYERS.items()
+}
+_MOVE_GATHERS = {
+    name: itemgetter(*perm) for name, perm in MOVE_PERMUTATIONS.items()
+}
+
+
+class FaceletPiece:
+    """A view on a single Piece of a FaceletCube.
+
+    The view follows its Piece around the cube, so `position` and `colors`
+    always describe the current state - as the Piece of a Cube does.
+    """
+
+    __slots__ = ("_cube", "_anchor", "type")
+
+    def __init__(self, cube, anchor):
+        self._cube = cube
+        self._anchor = anchor
+        facelets = SLOT_FACELETS[tuple(FACELET_POSITIONS[anchor])]
+        count = sum(f is not None for f in facelets)
+        self.type = (FACE, EDGE, CORNER)[count - 1]
+
+    @property
+    def position(self):
+        return FACELET_POSITIONS[self._cube._stickers.index(self._anchor)]
+
+    @property
+    def colors(self):
+        stickers = self._cube._stickers
+        palette = self._cube._palette
+        return [
+            None if f is None else palette[stickers[f]]
+            for f in SLOT_FACELETS[tuple(self.position)]
+        ]
+
+    def __str__(self):
+        colors = "".join(c for c in self.colors if c is not None)
+        return f"({self.type}, {colors}, {self.position})"
+
+    def __repr__(self):
+        return f"FaceletPiece{self}"
+
+    def __eq__(self, other):
+        return (
+            hasattr(other, "position")
+            and hasattr(other, "colors")
+            and self.position == other.position
+            and list(self.colors) == list(other.colors)
+        )
+
+    def __ne__(self, other):
+        return not (self == other)
+
+
+class FaceletCube:
+    """A cube which stores its 54 stickers in a flat bytearray.
+
+    The stickers are kept in the cube_str order (see Cube.__post_init__).
+    Each byte holds the index the sticker had when the cube was created,
+    the colors are looked up in a palette. A move is a single gather
+    through a precomputed 54-entry permutation.
+    Offers the same public API as Cube, so Solver can use either.
+    """
+
+    def __init__(self, cube_str: Union[str, FaceletCube]):
+        self.cube_str = cube_str
+        if isinstance(cube_str, FaceletCube):
+            self._stickers = bytearray(cube_str._stickers)
+            self._palette = cube_str._palette
+            self._key_table = cube_str._key_table
+            self._pieces_by_colors = cube_str._pieces_by_colors
+        else:
+            if not isinstance(cube_str, str):
+                cube_str = cube_str.flat_str()
+            cube_str = "".join(
+                x for x in cube_str if x not in string.whitespace
+            )
+            assert len(cube_str) == 54
+            self._stickers = bytearray(range(54))
+            self._palette = tuple(cube_str)
+            # translates the stickers into the bytes of their colors, one
+            # byte per sticker only works for ASCII colors
+            self._key_table = (
+                cube_str.encode().ljust(256, b"\0")
+                if cube_str.isascii()
+                else None
+            )
+            self._pieces_by_colors = self._index_pieces()
+        self._views = [None] * 54
+
+    def copy(self):
+        return FaceletCube(self)
+
+    def snapshot(self):
+        """:return: The current state, which restore() brings back"""
+        return bytes(self._stickers)
+
+    def restore(self, snapshot):
+        """Bring the cube back to a state returned by snapshot()."""
+        self._stickers = bytearray(snapshot)
+
+    def _index_pieces(self):
+        pieces = {}
+        for position, facelets in SLOT_FACELETS.items():
+            colors = [self._palette[f] for f in facelets if f is not None]
+            anchor = next(f for f in facelets if f is not None)
+            pieces.setdefault((len(colors), frozenset(colors)), anchor)
+        return pieces
+
+    def _piece(self, anchor):
+        piece = self._views[anchor]
+        if piece is None:
+            piece = self._views[anchor] = FaceletPiece(self, anchor)
+        return piece
+
+    def _move(self, name):
+        self._stickers = bytearray(_MOVE_GATHERS[name](self._stickers))
+
+    def L(self):
+        self._move("L")
+
+    def Li(self):
+        self._move("Li")
+
+    def R(self):
+        self._move("R")
+
+    def Ri(self):
+        self._move("Ri")
+
+    def U(self):
+        self._move("U")
+
+    def Ui(self):
+        self._move("Ui")
+
+    def D(self):
+        self._move("D")
+
+    def Di(self):
+        self._move("Di")
+
+    def F(self):
+        self._move("F")
+
+    def Fi(self):
+        self._move("Fi")
+
+    def B(self):
+        self._move("B")
+
+    def Bi(self):
+        self._move("Bi")
+
+    def M(self):
+        self._move("M")
+
+    def Mi(self):
+        self._move("Mi")
+
+    def E(self):
+        self._move("E")
+
+    def Ei(self):
+        self._move("Ei")
+
+    def S(self):
+        self._move("S")
+
+    def Si(self):
+        self._move("Si")
+
+    def X(self):
+        self._move("X")
+
+    def Xi(self):
+        self._move("Xi")
+
+    def Y(self):
+        self._move("Y")
+
+    def Yi(self):
+        self._move("Yi")
+
+    def Z(self):
+        self._move("Z")
+
+    def Zi(self):
+        self._move("Zi")
+
+    def sequence(self, move_str):
+        """
+        :param move_str: A string containing notated moves separated by
+        spaces: "L Ri U M Ui B M"
+        """
+        try:
+            gathers = [_MOVE_GATHERS[name] for name in move_str.split()]
+        except KeyError as e:
+            raise AttributeError(f"Unknown move: {e.args[0]}") from None
+        stickers = self._stickers
+        for gather in gathers:
+            stickers = gather(stickers)
+        self._stickers = bytearray(stickers)
+
+    def is_solved(self):
+        colors = self._color_list()
+        return all(
+            len(set(colors[f] for f in facelets)) == 1
+            for facelets in FACE_FACELETS.values()
+        )
+
+    def find_piece(self, *colors):
+        if None in colors:
+            return
+        anchor = self._pieces_by_colors.get((len(colors), frozenset(colors)))
+        if anchor is None:
+            return
+        return self._piece(anchor)
+
+    def get_piece(self, x, y, z):
+        """
+        :return: the Piece at the given Point
+        """
+        facelets = SLOT_FACELETS.get((x, y, z))
+        if facelets is None:
+            return
+        f = next(f for f in facelets if f is not None)
+        return self._piece(FACELET_ANCHORS[self._stickers[f]])
+
+    def __getitem__(self, *args):
+        if len(args) == 1:
+            return self.get_piece(*args[0])
+        return self.get_piece(*args)
+
+    def __eq__(self, other):
+        return isinstance(other, FaceletCube) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        """
+        :return: The colors of the 54 stickers as bytes, equal to the key
+        of a Cube in the same state
+        """
+        if self._key_table is None:
+            palette = self._palette
+            return "".join([palette[s] for s in self._stickers]).encode()
+        return bytes(self._stickers).translate(self._key_table)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def colors(self):
+        """
+        :return: A set containing the colors of all stickers on the cube
+        """
+        return set(self._palette)
+
+    def _center_color(self, face):
+        return self._palette[self._stickers[FACE_FACELETS[tuple(face)][4]]]
+
+    def left_color(self):
+        return self._center_color(LEFT)
+
+    def right_color(self):
+        return self._center_color(RIGHT)
+
+    def up_color(self):
+        return self._center_color(UP)
+
+    def down_color(self):
+        return self._center_color(DOWN)
+
+    def front_color(self):
+        return self._center_color(FRONT)
+
+    def back_color(self):
+        return self._center_color(BACK)
+
+    def _color_list(self):
+        palette = self._palette
+        return [palette[s] for s in self._stickers]
+
+    def flat_str(self):
+        return "".join(self._color_list())
+
+    def __str__(self):
+        template = (
+            "    {}{}{}\n"
+            "    {}{}{}\n"
+            "    {}{}{}\n"
+            "{}{}{} {}{}{} {}{}{} {}{}{}\n"
+            "{}{}{} {}{}{} {}{}{} {}{}{}\n"
+            "{}{}{} {}{}{} {}{}{} {}{}{}\n"
+            "    {}{}{}\n"
+            "    {}{}{}\n"
+            "    {}{}{}"
+        )
+
+        return "    " + template.format(*self._color_list()).strip()
@@ -1,24 +1,25 @@
 from game.point import Point
 from typing import Union, List
-from dataclasses import dataclass
 
 
-@dataclass
 class Matrix:
     """A 3x3 matrix"""
 
-    vals: Union[List[int], List[List[int]]]
+    # rotations caches the rotation table of game.piece for these vals
+    __slots__ = ("vals", "rotations")
+    __hash__ = None
 
-    def __post_init__(self):
-        if len(self.vals) == 9:
-            self.vals = list(self.vals)
-        elif len(self.vals) == 3:
+    def __init__(self, vals: Union[List[int], List[List[int]]]):
+        vals = list(vals)
+        if len(vals) == 3:
             try:
-                self.vals = [x for y in self.vals for x in y]
-            except:
-                self.vals = []
-        if len(self.vals) != 9:
-            raise ValueError(f"Matrix requires 9 items, got {self.vals}")
+                vals = [x for y in vals for x in y]
+            except TypeError:
+                vals = []
+        if len(vals) != 9:
+            raise ValueError(f"Matrix requires 9 items, got {vals}")
+        self.vals = vals
+        self.rotations = None
 
     def __str__(self):
         return (
@@ -33,7 +34,7 @@ class Matrix:
         )
 
     def __eq__(self, other):
-        return self.vals == other.vals
+        return isinstance(other, Matrix) and self.vals == other.vals
 
     def __add__(self, other):
         return Matrix(a + b for a, b in zip(self.vals, other.vals))
@@ -43,24 +44,41 @@ class Matrix:
 
     def __iadd__(self, other):
         self.vals = [a + b for a, b in zip(self.vals, other.vals)]
+        self.rotations = None
         return self
 
     def __isub__(self, other):
         self.vals = [a - b for a, b in zip(self.vals, other.vals)]
+        self.rotations = None
         return self
 
     def __mul__(self, other):
         """Do Matrix-Matrix or Matrix-Point multiplication."""
         if isinstance(other, Point):
-            return Point(
-                tuple([other.dot(Point(tuple(row))) for row in self.rows()])
-            )
+            return Point(*self.apply(other.x, other.y, other.z))
         elif isinstance(other, Matrix):
+            a, b, c, d, e, f, g, h, i = other.vals
             return Matrix(
-                Point(row).dot(Point(col))
-                for row in self.rows()
-                for col in other.cols()
+                [
+                    x
+                    for row in self.rows()
+                    for x in (
+                        row[0] * a + row[1] * d + row[2] * g,
+                        row[0] * b + row[1] * e + row[2] * h,
+                        row[0] * c + row[1] * f + row[2] * i,
+                    )
+                ]
             )
+        return NotImplemented
+
+    def apply(self, x, y, z):
+        """:return: The components of the product with the vector x, y, z"""
+        a, b, c, d, e, f, g, h, i = self.vals
+        return (
+            a * x + b * y + c * z,
+            d * x + e * y + f * z,
+            g * x + h * y + i * z,
+        )
 
     def rows(self):
         yield self.vals[0:3]
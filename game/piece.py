@@ -1,6 +1,16 @@
 from dataclasses import dataclass
-from constants import FACE, EDGE, CORNER
-from game.point import Point
+from constants import (
+    FACE,
+    EDGE,
+    CORNER,
+    ROT_XY_CC,
+    ROT_XY_CW,
+    ROT_XZ_CC,
+    ROT_XZ_CW,
+    ROT_YZ_CC,
+    ROT_YZ_CW,
+)
+from game.point import POSITIONS, Point, position
 from typing import Union, Tuple
 
 
@@ -15,10 +25,19 @@ class Piece:
 
     def __post_init__(self):
         assert all(p in (-1, 0, 1) for p in self.position)
+        self.position = position(*self.position)
         assert len(self.colors) == 3
         self.colors = list(self.colors)
         self._set_piece_type()
 
+    def copy(self):
+        """:return: A copy, without the checks of __post_init__"""
+        piece = object.__new__(Piece)
+        piece.position = self.position
+        piece.colors = list(self.colors)
+        piece.type = self.type
+        return piece
+
     def _set_piece_type(self):
         if self.colors.count(None) == 2:
             self.type = FACE
@@ -33,24 +52,69 @@ class Piece:
 
     def rotate(self, matrix):
         """Rotation matrix multiplication for a single piece"""
-        before = self.position
-        self.position = matrix * self.position
-
-        # we need to swap the positions of two things in self.colors
-        # so colors appear on the correct faces.
-        # rot gives us the axes to swap between.
-        rot = self.position - before
-        if not any(rot):
-            return  # no change occurred
-        if rot.count(0) == 2:
-            rot += matrix * rot
-
-        assert rot.count(0) == 1, (
-            f"There is a bug in the Piece.rotate() method!"
-            f"\nbefore: {before}"
-            f"\nafter: {self.position}"
-            f"\nchanges: {rot}"
-        )
-
-        i, j = (i for i, x in enumerate(rot) if x != 0)
-        self.colors[i], self.colors[j] = self.colors[j], self.colors[i]
+        table = matrix.rotations or rotation_table(matrix)
+        index = self.position.index
+        if index is None:
+            p = self.position
+            index = position(p.x, p.y, p.z).index
+        self.position, swap = table[index]
+        if swap:
+            i, j = swap
+            self.colors[i], self.colors[j] = self.colors[j], self.colors[i]
+
+
+def _rotation(matrix, before):
+    """
+    :return: The position before is rotated to and the two axes of the
+    colors to swap (None if the colors stay)
+    """
+    x, y, z = matrix.apply(*before)
+    after = position(x, y, z)
+
+    # we need to swap the positions of two things in self.colors
+    # so colors appear on the correct faces.
+    # rot gives us the axes to swap between.
+    rot = (x - before[0], y - before[1], z - before[2])
+    if not any(rot):
+        return after, None  # no change occurred
+    if rot.count(0) == 2:
+        turned = matrix.apply(*rot)
+        rot = tuple(a + b for a, b in zip(rot, turned))
+
+    assert rot.count(0) == 1, (
+        f"There is a bug in the Piece.rotate() method!"
+        f"\nbefore: {before}"
+        f"\nafter: {after}"
+        f"\nchanges: {rot}"
+    )
+    return after, tuple(i for i, x in enumerate(rot) if x != 0)
+
+
+def rotation_table(matrix):
+    """
+    :return: A tuple with the result of _rotation for each of the 26
+    positions, indexed by Point.index. The table is cached on the matrix,
+    so Piece.rotate only looks it up once per matrix. The tables of the 6
+    rotations in constants.py are built on import, those of other
+    matrices on first use.
+    """
+    if matrix.rotations is None:
+        key = tuple(matrix.vals)
+        if key not in _ROTATION_TABLES:
+            _ROTATION_TABLES[key] = tuple(
+                _rotation(matrix, xyz) for xyz in POSITIONS
+            )
+        matrix.rotations = _ROTATION_TABLES[key]
+    return matrix.rotations
+
+
+_ROTATION_TABLES = {}
+for _matrix in (
+    ROT_XY_CW,
+    ROT_XY_CC,
+    ROT_XZ_CW,
+    ROT_XZ_CC,
+    ROT_YZ_CW,
+    ROT_YZ_CC,
+):
+    rotation_table(_matrix)
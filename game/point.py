@@ -1,28 +1,43 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from itertools import product
 from typing import Tuple, Union, Optional
 
 
-@dataclass
 class Point:
     """A 3D point/vector"""
 
-    x: Union[Tuple, int]
-    y: Optional[int] = None
-    z: Optional[int] = None
-
-    def __post_init__(self):
-        if isinstance(self.x, (tuple, Point)):
-            t = self.x
-            self.x = t[0]
-            self.y = t[1]
-            self.z = t[2]
-        if any(component is None for component in self):
-            raise ValueError(f"Point contains 'None': {self}")
+    __slots__ = ("x", "y", "z")
+    # Points are mutable, so they can not be hashed
+    __hash__ = None
+    # The number of a point of POSITIONS, None for other points
+    index = None
+
+    def __init__(
+        self,
+        x: Union[Tuple, Point, int],
+        y: Optional[int] = None,
+        z: Optional[int] = None,
+    ):
+        if y is None or z is None:
+            if isinstance(x, (tuple, Point)):
+                x, y, z = x[0], x[1], x[2]
+            if x is None or y is None or z is None:
+                raise ValueError(f"Point contains 'None': {(x, y, z)}")
+        self.x = x
+        self.y = y
+        self.z = z
 
     def __str__(self):
-        return str(tuple(self))
+        return str((self.x, self.y, self.z))
+
+    def copy(self):
+        """:return: A copy, without the checks of __init__"""
+        point = object.__new__(Point)
+        point.x = self.x
+        point.y = self.y
+        point.z = self.z
+        return point
 
     def __repr__(self):
         return "Point" + str(self)
@@ -59,9 +74,7 @@ class Point:
         raise IndexError("Point index out of range")
 
     def __iter__(self):
-        yield self.x
-        yield self.y
-        yield self.z
+        return iter((self.x, self.y, self.z))
 
     def __iadd__(self, other):
         self.x += other.x
@@ -83,7 +96,7 @@ class Point:
                 and self.z == other[2]
             )
         return (
-            isinstance(other, self.__class__)
+            isinstance(other, Point)
             and self.x == other.x
             and self.y == other.y
             and self.z == other.z
@@ -91,3 +104,46 @@ class Point:
 
     def __ne__(self, other):
         return not (self == other)
+
+
+class _SharedPoint(Point):
+    """A point of POSITIONS, which can't be changed"""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index, x, y, z):
+        set_attribute = object.__setattr__
+        for name, value in zip(("index", "x", "y", "z"), (index, x, y, z)):
+            set_attribute(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"The shared point {self} can't be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"The shared point {self} can't be changed")
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __isub__(self, other):
+        return self - other
+
+
+# One shared Point for each of the 26 positions of a piece. The pieces of a
+# cube only ever replace their position by another of these points, so
+# moving a piece allocates nothing. The points are shared by all cubes and
+# can't be changed, += and -= give new points.
+POSITIONS = {
+    xyz: _SharedPoint(i, *xyz)
+    for i, xyz in enumerate(
+        xyz for xyz in product((-1, 0, 1), repeat=3) if xyz != (0, 0, 0)
+    )
+}
+
+
+def position(x, y, z):
+    """:return: The shared point of POSITIONS at x, y, z"""
+    try:
+        return POSITIONS[x, y, z]
+    except KeyError:
+        return Point(x, y, z)
@@ -0,0 +1,139 @@
+"""Reproducible scrambles.
+
+Two kinds of scrambles are generated:
+
+- "moves": a random sequence of face turns, without two turns of the same
+  face in a row and without three turns of one axis in a row (like U D U),
+  which would partly cancel
+- "state": a uniformly random solvable state, drawn as random cubie
+  coordinates with matching corner and edge permutation parity
+
+The scrambles are generated in chunks, each with its own random generator
+derived from the seed. The output for a seed is the same, no matter how
+many worker processes generate it.
+"""
+
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from game.cubie_cube import (
+    N_CORNER_ORIENTATION,
+    N_CORNER_PERMUTATION,
+    N_EDGE_ORIENTATION,
+    N_EDGE_PERMUTATION,
+    CubieCube,
+    permutation_parity,
+)
+from game.facelet_cube import FaceletCube
+
+SOLVED = CubieCube().to_cube_str()
+CHUNK_SIZE = 1000
+
+# Faces of the same axis
+_AXES = {"U": "UD", "D": "UD", "R": "RL", "L": "RL", "F": "FB", "B": "FB"}
+# A half turn is written as two quarter turns
+_TURNS = ("{}", "{0} {0}", "{}i")
+
+
+def random_moves(rng, length=25):
+    """
+    :param rng: A random.Random
+    :return: A string of length face turns
+    """
+    faces = []
+    while len(faces) < length:
+        face = rng.choice("URFDLB")
+        if faces and face == faces[-1]:
+            continue
+        if (
+            len(faces) > 1
+            and _AXES[face] == _AXES[faces[-1]] == _AXES[faces[-2]]
+        ):
+            continue
+        faces.append(face)
+    return " ".join(rng.choice(_TURNS).format(face) for face in faces)
+
+
+def random_state(rng):
+    """
+    :param rng: A random.Random
+    :return: A uniformly random solvable CubieCube
+    """
+    while True:
+        cube = CubieCube.from_coordinates(
+            rng.randrange(N_CORNER_PERMUTATION),
+            rng.randrange(N_CORNER_ORIENTATION),
+            rng.randrange(N_EDGE_PERMUTATION),
+            rng.randrange(N_EDGE_ORIENTATION),
+        )
+        if permutation_parity(cube.cp) == permutation_parity(cube.ep):
+            return cube
+
+
+def _chunk(seed, index, size, mode, length):
+    rng = random.Random(f"{seed}:{index}")
+    cube_strs = []
+    for _ in range(size):
+        if mode == "moves":
+            cube = FaceletCube(SOLVED)
+            cube.sequence(random_moves(rng, length))
+            cube_strs.append(cube.flat_str())
+        else:
+            cube_strs.append(random_state(rng).to_cube_str())
+    return cube_strs
+
+
+def scrambles(
+    n=None,
+    seed=None,
+    mode="moves",
+    length=25,
+    workers=1,
+    cube_type=None,
+):
+    """
+    :param n: Number of scrambles, endless if None
+    :param seed: Any int or str, a random seed if None
+    :param mode: "moves" or "state"
+    :param length: Number of face turns of a "moves" scramble
+    :param workers: Number of processes generating the scrambles,
+    os.cpu_count() if None
+    :param cube_type: If given, e.g. Cube, the scrambles are yielded as
+    cube_type(cube_str) instead of cube_str
+    :return: A generator of scrambled cube_str
+    """
+    if mode not in ("moves", "state"):
+        raise ValueError(f"Unknown scramble mode: {mode}")
+    if seed is None:
+        seed = random.randrange(2**63)
+    sizes = (
+        repeat(CHUNK_SIZE)
+        if n is None
+        else [min(CHUNK_SIZE, n - i) for i in range(0, n, CHUNK_SIZE)]
+    )
+    chunks = (
+        (seed, index, size, mode, length) for index, size in enumerate(sizes)
+    )
+    for chunk in _generate(chunks, workers):
+        for cube_str in chunk:
+            yield cube_str if cube_type is None else cube_type(cube_str)
+
+
+def _generate(chunks, workers):
+    """Generate the chunks in order, in at most workers processes."""
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        for args in chunks:
+            yield _chunk(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in chunks:
+            pending.append(executor.submit(_chunk, *args))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,124 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from game.facelet_cube import (
+    FACELET_AXES,
+    FACELET_POSITIONS,
+    MOVE_PERMUTATIONS,
+    SLOT_FACELETS,
+    FaceletCube,
+)
+from game.point import POSITIONS
+
+# Index of the color None in the colors of a Piece extended by None
+_NONE = 3
+# The positions of the centers
+_CENTERS = frozenset(xyz for xyz in POSITIONS if xyz.count(0) == 2)
+# The moves which turn the whole cube
+_CUBE_ROTATIONS = frozenset(("X", "Xi", "Y", "Yi", "Z", "Zi"))
+
+
+class CompiledSequence:
+    """A sequence of moves composed into a single transform.
+
+    The moves are composed into one permutation of the 54 stickers. For a
+    Cube the permutation is turned into a transform of the pieces: for each
+    of the 26 positions the position the piece moves to and how its colors
+    are reordered. Applying the sequence then rotates every moved piece
+    once, independent of the number of moves.
+
+    The misplaced pieces a Cube tracks for is_solved are kept up to date:
+    if the centers stay, only the moved pieces are checked again, if the
+    whole cube is turned, the misplaced positions turn with it.
+    """
+
+    def __init__(self, move_str):
+        """
+        :param move_str: A string containing notated moves separated by
+        spaces: "L Ri U M Ui B M"
+        :raises AttributeError: for an unknown move, like Cube.sequence
+        """
+        self.moves = tuple(move_str.split())
+        permutation = tuple(range(54))
+        for name in self.moves:
+            try:
+                move = MOVE_PERMUTATIONS[name]
+            except KeyError:
+                raise AttributeError(f"Unknown move: {name}") from None
+            permutation = tuple(permutation[i] for i in move)
+        self.permutation = permutation
+        self._gather = itemgetter(*permutation)
+        self._pieces = self._piece_transforms()
+        # the transforms of the pieces which change
+        self._moved = tuple(
+            (xyz, transform)
+            for xyz, transform in self._pieces.items()
+            if transform[0] != xyz
+            or transform[1]((0, 1, 2, None))
+            != tuple(axis if xyz[axis] else None for axis in range(3))
+        )
+        self._centers_move = any(xyz in _CENTERS for xyz, _ in self._moved)
+        self._cube_rotation = all(
+            name in _CUBE_ROTATIONS for name in self.moves
+        )
+
+    def _piece_transforms(self):
+        destination = [None] * 54
+        for i, f in enumerate(self.permutation):
+            destination[f] = i
+        transforms = {}
+        for position, facelets in SLOT_FACELETS.items():
+            colors = [_NONE] * 3
+            for axis, f in enumerate(facelets):
+                if f is None:
+                    continue
+                new_position = FACELET_POSITIONS[destination[f]]
+                colors[FACELET_AXES[destination[f]]] = axis
+            transforms[position] = (tuple(new_position), itemgetter(*colors))
+        return transforms
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __str__(self):
+        return " ".join(self.moves)
+
+    def apply(self, cube):
+        """Apply all moves to a Cube or FaceletCube at once."""
+        if isinstance(cube, FaceletCube):
+            cube._stickers = bytearray(self._gather(cube._stickers))
+            return
+        by_position = cube._pieces_by_position
+        moved = [
+            (by_position[xyz], transform) for xyz, transform in self._moved
+        ]
+        for piece, (position, gather) in moved:
+            piece.position = POSITIONS[position]
+            piece.colors = list(gather((*piece.colors, None)))
+            by_position[position] = piece
+
+        misplaced = cube._misplaced
+        if misplaced is None:
+            return
+        if self._cube_rotation:
+            pieces = self._pieces
+            cube._misplaced = {pieces[xyz][0] for xyz in misplaced}
+            cube._find_solved_colors()
+        elif self._centers_move:
+            cube._misplaced = None
+        else:
+            solved = cube._solved_colors
+            for piece, (position, _) in moved:
+                if piece.colors == solved[position]:
+                    misplaced.discard(position)
+                else:
+                    misplaced.add(position)
+
+
+@lru_cache(maxsize=1024)
+def compile_sequence(move_str):
+    """
+    :return: The CompiledSequence of move_str, compiled once per process
+    for every distinct move_str
+    """
+    return CompiledSequence(move_str)
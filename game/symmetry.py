@@ -0,0 +1,130 @@
+"""The 48 symmetries of the cube and a canonical form of cube states.
+
+A symmetry is a whole cube rotation, optionally followed by mirroring the
+cube left to right. Both move the stickers, so every symmetry is a
+permutation of the 54 stickers. Two states are equivalent if a symmetry
+maps one onto the other after relabeling the colors. The canonical form of
+a state is the smallest of its equivalent states, with every color written
+as the face its center is on.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+
+from game.facelet_cube import (
+    FACELET_AXES,
+    FACELET_POSITIONS,
+    MOVE_PERMUTATIONS,
+    facelet_index,
+)
+from game.sequence import compile_sequence
+
+# Centers in the cube_str order and the faces they are on
+_CENTERS = [4, 22, 25, 28, 31, 49]
+_CENTER_FACES = b"ULFRBD"
+
+# Sequences of whole cube rotations reaching the 24 orientations
+ROTATIONS = tuple(
+    (up + " " + turn).strip()
+    for up in ("", "X", "X X", "Xi", "Z", "Zi")
+    for turn in ("", "Y", "Y Y", "Yi")
+)
+
+# The stickers mirrored left to right, x -> -x
+_MIRROR = tuple(
+    facelet_index((-p[0], p[1], p[2]), axis)
+    for p, axis in zip(FACELET_POSITIONS, FACELET_AXES)
+)
+
+_MOVES_BY_PERMUTATION = {
+    permutation: name for name, permutation in MOVE_PERMUTATIONS.items()
+}
+
+
+def _compose(first, second):
+    """:return: The permutation of applying first and then second"""
+    return tuple(first[i] for i in second)
+
+
+def _inverse(permutation):
+    inverse = [0] * len(permutation)
+    for i, j in enumerate(permutation):
+        inverse[j] = i
+    return tuple(inverse)
+
+
+class Symmetry:
+    def __init__(self, rotation, mirrored):
+        """
+        :param rotation: One of ROTATIONS
+        :param mirrored: Mirror the cube left to right after the rotation
+        """
+        self.rotation = rotation
+        self.mirrored = mirrored
+        permutation = compile_sequence(rotation).permutation
+        if mirrored:
+            permutation = _compose(permutation, _MIRROR)
+        self.permutation = permutation
+        self._gather = itemgetter(*permutation)
+        inverse = _inverse(permutation)
+        # A move on the transformed cube is the conjugated move on the
+        # original cube
+        self._moves = {
+            name: _MOVES_BY_PERMUTATION[
+                _compose(permutation, _compose(move, inverse))
+            ]
+            for name, move in MOVE_PERMUTATIONS.items()
+        }
+
+    def __repr__(self):
+        return f"Symmetry({self.rotation!r}, mirrored={self.mirrored})"
+
+    def apply(self, key):
+        """
+        :param key: The 54 sticker colors as bytes, see Cube.key
+        :return: The stickers of the transformed cube
+        """
+        return bytes(self._gather(key))
+
+    def map_moves(self, moves):
+        """
+        :param moves: Moves applied to the transformed cube, e.g. the
+        solution of a canonical form
+        :return: The moves which do the same to the original cube
+        """
+        return [self._moves[name] for name in moves]
+
+
+SYMMETRIES = tuple(
+    Symmetry(rotation, mirrored)
+    for mirrored in (False, True)
+    for rotation in ROTATIONS
+)
+
+
+# The permutations of all symmetries, to transform a state into its 48
+# equivalent states at once
+_PERMUTATIONS = np.array([s.permutation for s in SYMMETRIES], dtype=np.intp)
+_ROWS = np.arange(len(SYMMETRIES))[:, None]
+
+
+def canonical_form(cube):
+    """
+    :param cube: A Cube, FaceletCube or cube_str
+    :return: The canonical form as cube_str of face letters, and the
+    Symmetry which maps cube to it. Symmetry.map_moves turns a solution
+    of the canonical form into a solution of cube.
+    """
+    key = cube.encode() if isinstance(cube, str) else cube.key()
+    if len(set(key[i] for i in _CENTERS)) != 6:
+        raise ValueError(f"The centers must have 6 different colors: {key}")
+    states = np.frombuffer(key, dtype=np.uint8)[_PERMUTATIONS]
+    # relabel every color with the face of its center
+    labels = np.zeros((len(SYMMETRIES), 256), dtype=np.uint8)
+    labels[_ROWS, states[:, _CENTERS]] = np.frombuffer(
+        _CENTER_FACES, dtype=np.uint8
+    )
+    states = [state.tobytes() for state in labels[_ROWS, states]]
+    i = min(range(len(states)), key=states.__getitem__)
+    return states[i].decode(), SYMMETRIES[i]
@@ -2,11 +2,13 @@ import pytest
 
 from constants import BACK
 from constants import DOWN
+from constants import FACE
 from constants import FRONT
 from constants import LEFT
 from constants import RIGHT
 from constants import UP
 from game.cube import Cube
+from game.facelet_cube import FaceletCube
 from game.matrix import Matrix
 from game.piece import Piece
 from game.point import Point
@@ -1909,3 +1911,123 @@ def test__color_list(cube1, expected_color, request):
     cube1 = request.getfixturevalue(cube1)
     colors = cube1._color_list()
     assert expected_color == colors
+
+
+@pytest.mark.parametrize(
+    "move_str", ["R", "Mi", "Y", "Ri B B R Bi Bi D Bi Di", "X Ui M E Zi S"]
+)
+def test_piece_index_follows_moves(cube, move_str):
+    for name in move_str.split():
+        getattr(cube, name)()
+    cube.sequence(move_str)
+    for piece in cube.pieces:
+        assert cube.get_piece(*piece.position) is piece
+        colors = [c for c in piece.colors if c is not None]
+        assert cube.find_piece(*colors) is piece
+    assert cube.get_piece(0, 0, 0) is None
+
+
+def test_piece_index_of_copy(cube):
+    copy = Cube(cube)
+    copy.R()
+    assert cube.get_piece(1, 1, 1) is not copy.get_piece(1, 1, 1)
+    assert any(p is copy.get_piece(1, 1, 1) for p in copy.pieces)
+
+
+def test_copy(cube):
+    copy = cube.copy()
+    assert copy == cube
+    assert copy.flat_str() == cube.flat_str()
+    assert not any(a is b for a, b in zip(copy.pieces, cube.pieces))
+    # the positions are the shared points of POSITIONS
+    assert copy.get_piece(1, 1, 1).position is cube[1, 1, 1].position
+    copy.sequence("R U Ri")
+    assert copy != cube
+    assert copy.get_piece(1, 1, 1) in copy.pieces
+    assert copy.find_piece("U").type == FACE
+
+
+def test_shared_positions_can_not_be_changed(cube_str):
+    cube = Cube(cube_str)
+    other = Cube(cube_str)
+    piece = cube.get_piece(1, 1, 1)
+    with pytest.raises(AttributeError):
+        piece.position.x = 0
+    piece.position += Point(-1, 0, 0)
+    assert piece.position == (0, 1, 1)
+    assert other.get_piece(1, 1, 1).position == (1, 1, 1)
+    assert Cube(cube_str).flat_str() == other.flat_str()
+
+
+def test_snapshot_and_restore(cube):
+    before = cube.flat_str()
+    piece = cube.find_piece(cube.front_color(), cube.up_color())
+    snapshot = cube.snapshot()
+    cube.sequence("R U Ri M Y")
+    cube.restore(snapshot)
+    assert cube.flat_str() == before
+    assert cube.find_piece(cube.front_color(), cube.up_color()) is piece
+    assert cube.get_piece(*piece.position) is piece
+    cube.R()
+    cube.restore(snapshot)
+    assert cube.flat_str() == before
+
+
+def test_key_and_hash(cube, solved_cube, cube_str):
+    assert cube.key() == cube_str.encode()
+    assert len(solved_cube.key()) == 54
+    copy = cube.copy()
+    assert hash(copy) == hash(cube)
+    assert len({cube, copy, solved_cube}) == 2
+    copy.sequence("R U")
+    assert copy.key() != cube.key()
+    copy.sequence("Ui Ri")
+    assert copy.key() == cube.key()
+
+
+def _faces_uniform(cube):
+    return FaceletCube(cube.flat_str()).is_solved()
+
+
+@pytest.mark.parametrize(
+    "moves",
+    [
+        "",
+        "X",
+        "Y Zi",
+        "R",
+        "R Ri",
+        "M",
+        "M Mi",
+        "E E E E",
+        "X R Xi Li",
+        "S Si U",
+    ],
+)
+def test_is_solved_tracks_moves(solved_cube, moves):
+    for move in moves.split():
+        getattr(solved_cube, move)()
+    assert solved_cube.is_solved() == _faces_uniform(solved_cube)
+
+
+def test_is_solved_matches_faces(cube):
+    moves = "R U Ri M Y F Di S Xi B E L Zi".split()
+    copy = cube.copy()
+    for i in range(200):
+        getattr(cube, moves[i * 7 % len(moves)])()
+        assert cube.is_solved() == _faces_uniform(cube)
+    copy.sequence(" ".join(moves))
+    assert copy.is_solved() == _faces_uniform(copy)
+
+
+def test_is_solved_after_copy_and_restore(solved_cube):
+    assert solved_cube.is_solved()
+    snapshot = solved_cube.snapshot()
+    solved_cube.R()
+    copy = solved_cube.copy()
+    assert not copy.is_solved()
+    copy.Ri()
+    assert copy.is_solved()
+    assert not solved_cube.is_solved()
+    solved_cube.restore(snapshot)
+    assert solved_cube.is_solved()
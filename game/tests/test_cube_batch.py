@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from game.cube import Cube
+from game.cube_batch import CubeBatch
+from game.facelet_cube import FaceletCube
+from game.sequence import compile_sequence
+
+
+@pytest.fixture
+def batch(cube_str, solved_cube_str):
+    return CubeBatch([cube_str, solved_cube_str, Cube(cube_str)])
+
+
+def test_round_trip(batch, cube_str, solved_cube_str):
+    assert batch.states.shape == (3, 54)
+    assert batch.states.dtype == np.uint8
+    assert len(batch) == 3
+    assert batch.cube_strs() == [cube_str, solved_cube_str, cube_str]
+    assert batch[1] == solved_cube_str
+    assert batch[1:].cube_strs() == [solved_cube_str, cube_str]
+
+
+@pytest.mark.parametrize(
+    "move_str", ["R", "Mi", "Y", "Ri S Ri Ri S S Ri Fi Fi R Si Si"]
+)
+def test_sequence_identical_to_cube(batch, move_str):
+    expected = []
+    for cube_str in batch.cube_strs():
+        cube = Cube(cube_str)
+        cube.sequence(move_str)
+        expected.append(cube.flat_str())
+    compiled = batch.copy()
+    batch.sequence(move_str)
+    assert batch.cube_strs() == expected
+    compiled.sequence(compile_sequence(move_str))
+    assert compiled.cube_strs() == expected
+
+
+def test_is_solved(batch):
+    assert batch.is_solved().tolist() == [False, True, False]
+    batch.sequence("R U")
+    assert not batch.is_solved().any()
+    batch.sequence("Ui Ri")
+    assert batch.is_solved().tolist() == [False, True, False]
+
+
+def test_equals_and_hashes(batch, cube_str):
+    assert batch.equals(batch.copy()).all()
+    assert batch.equals(FaceletCube(cube_str)).tolist() == [True, False, True]
+    hashes = batch.hashes()
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[2] != hashes[1]
+    np.testing.assert_array_equal(CubeBatch(batch.states).hashes(), hashes)
+
+
+def test_unique(batch):
+    unique, inverse = batch.unique()
+    assert len(unique) == 2
+    assert [unique[i] for i in inverse] == batch.cube_strs()
+
+
+def test_repeat(cube):
+    batch = CubeBatch.repeat(cube, 1000)
+    batch.sequence("R U Ri Ui")
+    assert len(set(batch.hashes().tolist())) == 1
+
+
+def test_invalid_shape():
+    with pytest.raises(ValueError):
+        CubeBatch(np.zeros((2, 53), dtype=np.uint8))
@@ -0,0 +1,94 @@
+import pytest
+
+from game.cube import Cube
+from game.cubie_cube import CubieCube
+from game.cubie_cube import FACE_MOVES
+from game.cubie_cube import MOVE_TABLES
+from game.cubie_cube import SOLVED
+from game.cubie_cube import center_colors
+from game.cubie_cube import permutation_parity
+from game.cubie_cube import permutation_rank
+from game.cubie_cube import permutation_unrank
+from game.facelet_cube import FaceletCube
+
+
+@pytest.fixture
+def scramble():
+    return "Di R L F Ri L U U F D D Ri L L F F D R R B B D D L L Ui B B Ui"
+
+
+def test_solved_cube(solved_cube_str):
+    cubie_cube = CubieCube()
+    assert cubie_cube.is_solved()
+    assert cubie_cube.coordinates() == (0, 0, 0, 0)
+    assert cubie_cube.to_cube_str() == solved_cube_str
+    assert CubieCube.from_cube_str(solved_cube_str) == cubie_cube
+
+
+def test_from_cube_str_round_trip(cube_str):
+    cubie_cube = CubieCube.from_cube_str(cube_str)
+    assert not cubie_cube.is_solved()
+    assert cubie_cube.to_cube_str(center_colors(cube_str)) == cube_str
+
+
+def test_from_cube_round_trip(cube):
+    cubie_cube = CubieCube.from_cube(cube)
+    colors = center_colors(cube.flat_str())
+    assert cubie_cube.to_cube(colors) == cube
+
+
+@pytest.mark.parametrize(
+    "coordinates", [(0, 0, 0, 0), (40319, 2186, 479001599, 2047)]
+)
+def test_coordinates_round_trip(coordinates):
+    cubie_cube = CubieCube.from_coordinates(*coordinates)
+    assert cubie_cube.coordinates() == coordinates
+
+
+def test_coordinates_of_scrambled_cube(scramble):
+    cubie_cube = CubieCube()
+    cubie_cube.sequence(scramble)
+    assert CubieCube.from_coordinates(*cubie_cube.coordinates()) == cubie_cube
+
+
+@pytest.mark.parametrize("move", FACE_MOVES)
+def test_move_identical_to_facelet_cube(move):
+    facelet_cube = FaceletCube(SOLVED.to_cube_str())
+    getattr(facelet_cube, move)()
+    cubie_cube = CubieCube()
+    cubie_cube.move(move)
+    assert cubie_cube.to_cube_str() == facelet_cube.flat_str()
+
+
+def test_sequence_identical_to_cube(solved_cube_str, scramble):
+    cube = Cube(solved_cube_str)
+    cube.sequence(scramble)
+    cubie_cube = CubieCube()
+    cubie_cube.sequence(scramble)
+    assert cubie_cube == CubieCube.from_cube(cube)
+    assert permutation_parity(cubie_cube.cp) == permutation_parity(
+        cubie_cube.ep
+    )
+
+
+def test_multiply_and_inverse(scramble):
+    cubie_cube = CubieCube()
+    cubie_cube.sequence(scramble)
+    assert cubie_cube.multiply(cubie_cube.inverse()).is_solved()
+    assert cubie_cube.inverse().multiply(cubie_cube).is_solved()
+    r = CubieCube(*MOVE_TABLES["R"])
+    expected = CubieCube(
+        cubie_cube.cp, cubie_cube.co, cubie_cube.ep, cubie_cube.eo
+    )
+    expected.move("R")
+    assert cubie_cube.multiply(r) == expected
+
+
+@pytest.mark.parametrize("perm", [(0, 1, 2), (2, 0, 1), (3, 1, 0, 2)])
+def test_permutation_rank(perm):
+    assert permutation_unrank(permutation_rank(perm), len(perm)) == perm
+
+
+def test_invalid_cube_str(solved_cube_str):
+    with pytest.raises(ValueError):
+        CubieCube.from_cube_str("F" + solved_cube_str[1:])
@@ -0,0 +1,189 @@
+import pytest
+
+from constants import FRONT
+from constants import LEFT
+from constants import UP
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.facelet_cube import MOVE_PERMUTATIONS
+from game.facelet_cube import facelet_index
+from game.piece import Piece
+from game.point import Point
+from solving_methods.solver import Solver
+
+
+@pytest.fixture
+def facelet_cube(cube_str):
+    return FaceletCube(cube_str)
+
+
+@pytest.fixture
+def solved_facelet_cube(solved_cube_str):
+    return FaceletCube(solved_cube_str)
+
+
+def test_class_facelet_cube_works_with_cube_str(facelet_cube):
+    assert isinstance(facelet_cube, FaceletCube)
+
+
+def test_class_facelet_cube_works_also_with_cube_instance(facelet_cube, cube):
+    assert FaceletCube(facelet_cube) == facelet_cube
+    assert FaceletCube(cube) == facelet_cube
+
+
+def test_copy_is_independent(facelet_cube):
+    copy = FaceletCube(facelet_cube)
+    copy.R()
+    assert copy != facelet_cube
+    copy = facelet_cube.copy()
+    assert copy == facelet_cube
+    copy.R()
+    assert copy != facelet_cube
+
+
+def test_key_identical_to_cube(facelet_cube, cube):
+    assert facelet_cube.key() == cube.key()
+    facelet_cube.sequence("R M Y")
+    cube.sequence("R M Y")
+    assert facelet_cube.key() == cube.key()
+    assert hash(facelet_cube) == hash(cube)
+    assert hash(facelet_cube.copy()) == hash(facelet_cube)
+
+
+def test_key_of_non_ascii_colors(cube_str):
+    cube_str = cube_str.translate(str.maketrans("UF", "ÜΦ"))
+    facelet_cube = FaceletCube(cube_str)
+    cube = Cube(cube_str)
+    assert facelet_cube.key() == cube.key()
+    keys = {facelet_cube.key()}
+    for move in ("R", "U", "F", "Ri"):
+        facelet_cube.sequence(move)
+        cube.sequence(move)
+        assert facelet_cube.key() == cube.key()
+        keys.add(facelet_cube.key())
+    assert len(keys) == 5
+
+
+def test_snapshot_and_restore(facelet_cube):
+    before = facelet_cube.flat_str()
+    snapshot = facelet_cube.snapshot()
+    facelet_cube.sequence("R U Ri M Y")
+    facelet_cube.restore(snapshot)
+    assert facelet_cube.flat_str() == before
+
+
+@pytest.mark.parametrize(
+    "position, axis, expected",
+    [
+        (Point(-1, 1, -1), 1, 0),
+        (Point(1, 1, 1), 1, 8),
+        (Point(-1, 1, -1), 0, 9),
+        (Point(1, 1, 1), 2, 14),
+        (Point(1, 1, -1), 2, 18),
+        (Point(0, 0, -1), 2, 31),
+        (Point(-1, -1, 1), 1, 45),
+        (Point(1, -1, -1), 1, 53),
+    ],
+)
+def test_facelet_index(position, axis, expected):
+    assert facelet_index(position, axis) == expected
+
+
+def test_move_permutations_are_permutations():
+    assert len(MOVE_PERMUTATIONS) == 24
+    for perm in MOVE_PERMUTATIONS.values():
+        assert sorted(perm) == list(range(54))
+
+
+@pytest.mark.parametrize("move", sorted(MOVE_PERMUTATIONS))
+def test_move_identical_to_cube(move, cube_str):
+    cube = Cube(cube_str)
+    facelet_cube = FaceletCube(cube_str)
+    getattr(cube, move)()
+    getattr(facelet_cube, move)()
+    assert facelet_cube.flat_str() == cube.flat_str()
+    assert str(facelet_cube) == str(cube)
+
+
+def test_sequence_identical_to_cube(cube_str):
+    move_str = "Ri B B R Bi Bi D Bi Di M E S X Y Z Ui Fi Li"
+    cube = Cube(cube_str)
+    facelet_cube = FaceletCube(cube_str)
+    cube.sequence(move_str)
+    facelet_cube.sequence(move_str)
+    assert facelet_cube.flat_str() == cube.flat_str()
+
+
+def test_sequence_unknown_move(facelet_cube):
+    with pytest.raises(AttributeError):
+        facelet_cube.sequence("R Q")
+
+
+def test_is_solved(facelet_cube, solved_facelet_cube):
+    assert not facelet_cube.is_solved()
+    assert solved_facelet_cube.is_solved()
+    solved_facelet_cube.sequence("X M Y")
+    assert not solved_facelet_cube.is_solved()
+    solved_facelet_cube.sequence("Yi Mi Xi Z")
+    assert solved_facelet_cube.is_solved()
+
+
+@pytest.mark.parametrize(
+    "colors, expected_piece",
+    [
+        (
+            ["R", "U", "F"],
+            Piece(position=Point(1, 1, 1), colors=("R", "U", "F")),
+        ),
+        (
+            ["L", "U", "B"],
+            Piece(position=Point(-1, 1, -1), colors=("L", "U", "B")),
+        ),
+        (["U"], Piece(position=Point(0, 1, 0), colors=(None, "U", None))),
+        ([None, "U", "F"], None),
+    ],
+)
+def test_find_piece(colors, expected_piece, solved_facelet_cube):
+    piece = solved_facelet_cube.find_piece(*colors)
+    assert piece == expected_piece
+
+
+def test_piece_follows_moves(solved_facelet_cube):
+    piece = solved_facelet_cube.find_piece("U", "F")
+    assert piece.position == UP + FRONT
+    solved_facelet_cube.L()
+    assert piece.position == UP + FRONT
+    solved_facelet_cube.F()
+    assert piece.position == FRONT + Point(1, 0, 0)
+    assert piece.colors == ["U", None, "F"]
+    assert piece.type == "edge"
+
+
+@pytest.mark.parametrize("cube_fixture", ["cube_str", "solved_cube_str"])
+def test_get_piece_identical_to_cube(cube_fixture, request):
+    cube_str = request.getfixturevalue(cube_fixture)
+    cube = Cube(cube_str)
+    facelet_cube = FaceletCube(cube_str)
+    cube.sequence("R U Ri F M")
+    facelet_cube.sequence("R U Ri F M")
+    for position in (LEFT, LEFT + UP, LEFT + UP + FRONT, (0, -1, -1)):
+        assert facelet_cube[position] == cube[position]
+
+
+def test_colors(facelet_cube, cube):
+    assert facelet_cube.colors() == cube.colors()
+    assert facelet_cube.left_color() == cube.left_color()
+    assert facelet_cube.right_color() == cube.right_color()
+    assert facelet_cube.up_color() == cube.up_color()
+    assert facelet_cube.down_color() == cube.down_color()
+    assert facelet_cube.front_color() == cube.front_color()
+    assert facelet_cube.back_color() == cube.back_color()
+
+
+def test_solver_runs_unchanged(cube_str):
+    solver = Solver(Cube(cube_str))
+    solver.solve()
+    facelet_solver = Solver(FaceletCube(cube_str))
+    facelet_solver.solve()
+    assert facelet_solver.cube.is_solved()
+    assert facelet_solver.moves == solver.moves
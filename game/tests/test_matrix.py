@@ -1,5 +1,6 @@
 import pytest
 from game.matrix import Matrix
+from game.point import Point
 
 
 @pytest.fixture
@@ -38,3 +39,25 @@ def corrupt_input():
 def test__post_init__raises(corrupt_input):
     with pytest.raises(ValueError):
         Matrix(corrupt_input)
+
+
+@pytest.fixture
+def rotation():
+    return Matrix([0, 1, 0, -1, 0, 0, 0, 0, 1])
+
+
+def test__mul__point(rotation):
+    assert rotation * Point(1, 0, 0) == Point(0, -1, 0)
+    assert rotation.apply(1, 0, 0) == (0, -1, 0)
+
+
+def test__mul__matrix(rotation, input_list_by_rows):
+    full_turn = rotation * rotation * rotation * rotation
+    assert full_turn == Matrix([1, 0, 0, 0, 1, 0, 0, 0, 1])
+    assert rotation * Matrix(input_list_by_rows) == Matrix(
+        [14, 15, 16, -11, -12, -13, 17, 18, 19]
+    )
+
+
+def test__add__(matrix, input_list):
+    assert (matrix + matrix).vals == [2 * x for x in input_list]
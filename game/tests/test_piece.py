@@ -1,7 +1,15 @@
 import pytest
 from game.piece import Piece
+from game.piece import rotation_table
 from constants import FACE
+from constants import ROT_XY_CC
+from constants import ROT_XY_CW
+from constants import ROT_XZ_CC
+from constants import ROT_XZ_CW
+from constants import ROT_YZ_CC
+from constants import ROT_YZ_CW
 from game.matrix import Matrix
+from game.point import POSITIONS
 from game.point import Point
 
 
@@ -48,3 +56,51 @@ def test_rotate(piece, rotation_matrix):
     assert piece.colors == [None, "Red", None]
     assert position_before != piece.position
     assert piece.position == Point(0, -1, 0)
+
+
+def test_rotate_uses_shared_positions(rotation_matrix):
+    piece = Piece((1, 1, 1), ("R", "U", "F"))
+    assert piece.position is POSITIONS[1, 1, 1]
+    piece.rotate(rotation_matrix)
+    assert piece.position is POSITIONS[1, -1, 1]
+    assert piece.colors == ["U", "R", "F"]
+
+
+@pytest.mark.parametrize(
+    "matrix",
+    [ROT_XY_CW, ROT_XY_CC, ROT_XZ_CW, ROT_XZ_CC, ROT_YZ_CW, ROT_YZ_CC],
+)
+def test_rotation_table(matrix):
+    table = rotation_table(matrix)
+    assert rotation_table(matrix) is table
+    assert matrix.rotations is table
+    assert len(table) == len(POSITIONS)
+    for before, (after, swap) in zip(POSITIONS.values(), table):
+        assert after is POSITIONS[tuple(matrix * before)]
+        assert swap is None or len(swap) == 2
+    # four quarter turns bring every piece back with the same colors
+    piece = Piece((1, 1, 1), ("R", "U", "F"))
+    for _ in range(4):
+        piece.rotate(matrix)
+    assert piece.position == (1, 1, 1)
+    assert piece.colors == ["R", "U", "F"]
+
+
+def test_rotation_table_by_value():
+    assert rotation_table(Matrix(ROT_XY_CW.vals)) is rotation_table(ROT_XY_CW)
+
+
+def test_rotation_table_follows_matrix_changes():
+    matrix = Matrix(ROT_XY_CW.vals)
+    rotation_table(matrix)
+    matrix -= ROT_XY_CW
+    matrix += ROT_XY_CC
+    assert matrix.rotations is None
+    assert rotation_table(matrix) is rotation_table(ROT_XY_CC)
+
+
+def test_rotate_position_not_shared(rotation_matrix):
+    piece = Piece((1, 1, 1), ("R", "U", "F"))
+    piece.position = Point(1, 1, 1)
+    piece.rotate(rotation_matrix)
+    assert piece.position is POSITIONS[1, -1, 1]
@@ -1,5 +1,7 @@
 import pytest
+from game.point import POSITIONS
 from game.point import Point
+from game.point import position
 
 
 def test_class_point_exists():
@@ -80,3 +82,55 @@ def test_count(point, fake_value):
     assert point.count(-1) == 0
     assert point.count(0) == 2
     assert point.count(1) == 1
+
+
+def test_point_is_compact(point):
+    assert not hasattr(point, "__dict__")
+    assert tuple(point) == (1, 0, 0)
+    assert point == (1, 0, 0)
+    with pytest.raises(TypeError):
+        hash(point)
+
+
+def test_in_place_arithmetic(point, point_other):
+    moved = point
+    moved += point_other
+    assert moved is point
+    assert point == (1, 1, 0)
+    moved -= point_other
+    assert moved is point
+    assert point == (1, 0, 0)
+
+
+def test_in_place_arithmetic_on_shared_points(point_other):
+    shared = POSITIONS[1, 0, 0]
+    moved = shared
+    moved += point_other
+    assert moved == (1, 1, 0) and type(moved) is Point
+    assert shared == (1, 0, 0)
+    moved = shared
+    moved -= point_other
+    assert moved == (1, -1, 0) and type(moved) is Point
+    assert shared == (1, 0, 0)
+
+
+def test_shared_points_are_immutable():
+    shared = POSITIONS[1, 0, 0]
+    with pytest.raises(AttributeError):
+        shared.x = 2
+    with pytest.raises(AttributeError):
+        del shared.y
+    assert shared == (1, 0, 0)
+    assert shared == Point(1, 0, 0) and Point(1, 0, 0) == shared
+    copy = shared.copy()
+    copy.x = 0
+    assert copy == (0, 0, 0) and shared == (1, 0, 0)
+
+
+def test_positions():
+    assert len(POSITIONS) == 26
+    assert [p.index for p in POSITIONS.values()] == list(range(26))
+    assert Point(1, 1, 1).index is None
+    assert position(1, -1, 0) is POSITIONS[1, -1, 0]
+    assert position(1, -1, 0) == Point(1, -1, 0)
+    assert position(0, 0, 0) == Point(0, 0, 0)
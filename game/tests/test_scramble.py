@@ -0,0 +1,70 @@
+import random
+from itertools import groupby
+
+import pytest
+
+from game.cube import Cube
+from game.cubie_cube import CubieCube
+from game.cubie_cube import permutation_parity
+from game.scramble import random_moves
+from game.scramble import random_state
+from game.scramble import scrambles
+from solving_methods.solver import Solver
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_moves_have_no_cancellations(seed):
+    moves = random_moves(random.Random(seed), 40).split()
+    # a half turn is written as two quarter turns, so turns of the same
+    # face in a row are a single face turn
+    faces = [face for face, _ in groupby(move[0] for move in moves)]
+    assert len(faces) == 40
+    axes = [{"U": 0, "D": 0, "R": 1, "L": 1, "F": 2, "B": 2}[f] for f in faces]
+    assert not any(a == b == c for a, b, c in zip(axes, axes[1:], axes[2:]))
+
+
+def test_random_moves_count_face_turns():
+    moves = random_moves(random.Random(0), 25)
+    assert 25 <= len(moves.split()) <= 50
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_state_is_solvable(seed):
+    cube = random_state(random.Random(seed))
+    assert sum(cube.co) % 3 == 0
+    assert sum(cube.eo) % 2 == 0
+    assert permutation_parity(cube.cp) == permutation_parity(cube.ep)
+    assert CubieCube.from_cube_str(cube.to_cube_str()) == cube
+
+
+@pytest.mark.parametrize("mode", ["moves", "state"])
+def test_scrambles_are_reproducible(mode):
+    first = list(scrambles(5, seed=3, mode=mode))
+    assert len(first) == 5
+    assert list(scrambles(5, seed=3, mode=mode)) == first
+    assert list(scrambles(5, seed=4, mode=mode)) != first
+    assert list(scrambles(3, seed=3, mode=mode)) == first[:3]
+
+
+def test_scrambles_in_parallel():
+    expected = list(scrambles(2500, seed=1))
+    assert list(scrambles(2500, seed=1, workers=2)) == expected
+
+
+@pytest.mark.parametrize("mode", ["moves", "state"])
+def test_scrambles_can_be_solved(mode):
+    for cube in scrambles(3, seed=0, mode=mode, cube_type=Cube):
+        assert not cube.is_solved()
+        solver = Solver(cube)
+        solver.solve()
+        assert cube.is_solved()
+
+
+def test_endless_scrambles():
+    generator = scrambles(seed=0)
+    assert [next(generator) for _ in range(3)] == list(scrambles(3, seed=0))
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        next(scrambles(1, mode="random"))
@@ -0,0 +1,92 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.facelet_cube import MOVE_PERMUTATIONS
+from game.sequence import CompiledSequence
+from game.sequence import compile_sequence
+
+ALGORITHMS = [
+    "",
+    "Ri B B R Bi Bi D Bi Di",
+    "Ri S Ri Ri S S Ri Fi Fi R Si Si Ri Ri Si R Fi Fi",
+    "X Ui M E Zi Yi L Si",
+]
+
+
+def apply_one_by_one(cube, move_str):
+    for name in move_str.split():
+        getattr(cube, name)()
+
+
+@pytest.mark.parametrize("move_str", list(MOVE_PERMUTATIONS) + ALGORITHMS)
+def test_apply_identical_to_moves(cube, move_str):
+    expected = Cube(cube)
+    apply_one_by_one(expected, move_str)
+    CompiledSequence(move_str).apply(cube)
+    assert cube == expected
+    assert cube.flat_str() == expected.flat_str()
+
+
+@pytest.mark.parametrize("move_str", ALGORITHMS)
+def test_apply_to_facelet_cube(cube_str, move_str):
+    expected = FaceletCube(cube_str)
+    apply_one_by_one(expected, move_str)
+    facelet_cube = FaceletCube(cube_str)
+    CompiledSequence(move_str).apply(facelet_cube)
+    assert facelet_cube.flat_str() == expected.flat_str()
+
+
+@pytest.mark.parametrize(
+    "move_str", list(MOVE_PERMUTATIONS) + ALGORITHMS + ["X Y Zi", "Z R Zi"]
+)
+def test_apply_tracks_misplaced_pieces(cube, move_str):
+    cube.is_solved()
+    CompiledSequence(move_str).apply(cube)
+    misplaced = cube._misplaced
+    cube._track_solved()
+    if misplaced is not None:
+        assert misplaced == cube._misplaced
+
+
+@pytest.mark.parametrize(
+    "move_str", ["R", "Ui", "X", "Zi", "X Y Zi", "Z R Zi", ALGORITHMS[1]]
+)
+def test_apply_keeps_misplaced_pieces(cube, move_str):
+    cube.is_solved()
+    CompiledSequence(move_str).apply(cube)
+    assert cube._misplaced is not None
+
+
+def test_apply_keeps_solved(solved_cube):
+    solved_cube.is_solved()
+    solved_cube.sequence("R U Ri Ui")
+    assert not solved_cube.is_solved()
+    solved_cube.sequence("X Y Zi")
+    assert not solved_cube.is_solved()
+    solved_cube.sequence("Z Yi Xi")
+    solved_cube.sequence("U R Ui Ri")
+    assert solved_cube._misplaced is not None
+    assert solved_cube.is_solved()
+
+
+def test_apply_keeps_pieces(cube):
+    pieces = list(cube.pieces)
+    piece = cube.find_piece(cube.front_color(), cube.up_color())
+    cube.sequence(ALGORITHMS[1])
+    assert all(a is b for a, b in zip(pieces, cube.pieces))
+    assert cube.find_piece(cube.front_color(), cube.up_color()) is piece
+
+
+def test_compile_sequence_is_cached():
+    assert compile_sequence("R U Ri") is compile_sequence("R U Ri")
+    sequence = compile_sequence("R U Ri")
+    assert len(sequence) == 3
+    assert str(sequence) == "R U Ri"
+
+
+def test_unknown_move(cube):
+    before = cube.flat_str()
+    with pytest.raises(AttributeError):
+        cube.sequence("R Q")
+    assert cube.flat_str() == before
@@ -0,0 +1,62 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.symmetry import ROTATIONS
+from game.symmetry import SYMMETRIES
+from game.symmetry import canonical_form
+from solving_methods.solver import Solver
+
+
+def test_symmetries_are_distinct():
+    assert len(SYMMETRIES) == 48
+    assert len({s.permutation for s in SYMMETRIES}) == 48
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_canonical_form_of_rotations(cube_str, rotation):
+    expected = canonical_form(cube_str)[0]
+    cube = FaceletCube(cube_str)
+    cube.sequence(rotation)
+    assert canonical_form(cube)[0] == expected
+
+
+def test_canonical_form_of_mirrored_and_recolored(cube_str):
+    expected = canonical_form(cube_str)[0]
+    mirrored = SYMMETRIES[-1].apply(cube_str.encode()).decode()
+    assert canonical_form(mirrored)[0] == expected
+    recolored = cube_str.translate(str.maketrans("UDLRFB", "WYOGRB"))
+    assert canonical_form(recolored)[0] == expected
+
+
+def test_canonical_form_of_solved_cube(solved_cube):
+    canonical, symmetry = canonical_form(solved_cube)
+    assert Cube(canonical).is_solved()
+
+
+@pytest.mark.parametrize("index", [0, 5, 24, 47])
+def test_map_moves(cube_str, index):
+    transformed = SYMMETRIES[index].apply(cube_str.encode()).decode()
+    canonical, symmetry = canonical_form(transformed)
+    solver = Solver(Cube(canonical))
+    solver.solve()
+    cube = Cube(transformed)
+    cube.sequence(" ".join(symmetry.map_moves(solver.moves)))
+    assert cube.is_solved()
+
+
+def test_map_moves_of_mirror():
+    # turns about the x axis keep their direction when mirrored left to
+    # right, all other turns are reversed
+    assert SYMMETRIES[24].map_moves(["R", "U", "M", "X", "S"]) == [
+        "Li",
+        "Ui",
+        "M",
+        "X",
+        "Si",
+    ]
+
+
+def test_same_centers(solved_cube_str):
+    with pytest.raises(ValueError):
+        canonical_form(solved_cube_str.replace("D", "U"))
@@ -0,0 +1,76 @@
+import pytest
+
+from game.cubie_cube import CORNER_FACELETS
+from game.cubie_cube import EDGE_FACELETS
+from game.cubie_cube import CubieCube
+from game.validation import InvalidCubeError
+from game.validation import is_solvable
+from game.validation import validate
+
+
+def _replace(cube_str, stickers):
+    cube_str = list(cube_str)
+    for i, sticker in stickers.items():
+        cube_str[i] = sticker
+    return "".join(cube_str)
+
+
+def test_validate_solvable(cube_str, solved_cube_str):
+    assert validate(solved_cube_str) == CubieCube()
+    assert validate(cube_str) == CubieCube.from_cube_str(cube_str)
+    assert is_solvable(cube_str)
+
+
+def test_validate_ignores_whitespace(cube_str):
+    spaced = "\n".join(cube_str[i:][:9] for i in range(0, 54, 9))
+    assert validate(spaced) == validate(cube_str)
+
+
+@pytest.mark.parametrize(
+    "cubie_cube, reason",
+    [
+        (CubieCube(co=(1,) + (0,) * 7), "A corner is twisted"),
+        (CubieCube(co=(1, 1) + (0,) * 6), "A corner is twisted"),
+        (CubieCube(eo=(1,) + (0,) * 11), "An edge is flipped"),
+        (CubieCube(ep=(1, 0) + tuple(range(2, 12))), "Two pieces are swapped"),
+        (CubieCube(cp=(1, 0) + tuple(range(2, 8))), "Two pieces are swapped"),
+    ],
+)
+def test_validate_invariants(cubie_cube, reason):
+    with pytest.raises(InvalidCubeError, match=reason):
+        validate(cubie_cube.to_cube_str())
+    assert not is_solvable(cubie_cube.to_cube_str())
+
+
+def test_validate_length(solved_cube_str):
+    with pytest.raises(InvalidCubeError, match="Expected 54 stickers, got 53"):
+        validate(solved_cube_str[:-1])
+
+
+def test_validate_centers(solved_cube_str):
+    # the U center colored like the D center
+    with pytest.raises(InvalidCubeError, match="6 different colors"):
+        validate(_replace(solved_cube_str, {4: "D"}))
+
+
+def test_validate_sticker_counts(solved_cube_str):
+    corner = CORNER_FACELETS[0]
+    with pytest.raises(InvalidCubeError, match="Color X is not on any center"):
+        validate(_replace(solved_cube_str, {corner[0]: "X"}))
+    with pytest.raises(InvalidCubeError, match="Color U is on 8 stickers"):
+        validate(_replace(solved_cube_str, {corner[0]: "R"}))
+
+
+def test_validate_pieces(solved_cube_str):
+    # U and D of two corners exchanged: URF becomes DRF, which does not exist
+    a, b = CORNER_FACELETS[0][0], CORNER_FACELETS[4][0]
+    with pytest.raises(
+        InvalidCubeError, match="There is no corner DRF \\(in the URF slot\\)"
+    ):
+        validate(_replace(solved_cube_str, {a: "D", b: "U"}))
+
+    # the UF edge in the UR slot and the DR edge in the DF slot
+    ur, df = EDGE_FACELETS[0], EDGE_FACELETS[5]
+    cube_str = _replace(solved_cube_str, {ur[1]: "F", df[1]: "R"})
+    with pytest.raises(InvalidCubeError, match="The edge UF is twice"):
+        validate(cube_str)
@@ -0,0 +1,123 @@
+"""Check that a cube_str describes a solvable cube.
+
+A cube_str is solvable if and only if
+- it has 54 stickers and its 6 centers have different colors
+- every color is on 9 stickers
+- the stickers form the 8 corners and 12 edges, each exactly once
+- the corner orientations add up to a multiple of 3 (no twisted corner)
+- the edge orientations add up to a multiple of 2 (no flipped edge)
+- the corner and edge permutations have the same parity (no two pieces
+  swapped)
+"""
+
+import string
+from operator import itemgetter
+
+from game.cubie_cube import (
+    CORNER_FACELETS,
+    CORNERS,
+    EDGE_FACELETS,
+    EDGES,
+    FACES,
+    CubieCube,
+    center_colors,
+    permutation_parity,
+)
+
+# Faces of the stickers of a corner or edge, in the order of its facelets,
+# mapped to the piece and its orientation
+_CORNERS = {
+    corner[o:] + corner[:o]: (i, (3 - o) % 3)
+    for i, corner in enumerate(CORNERS)
+    for o in range(3)
+}
+_EDGES = {
+    edge[o:] + edge[:o]: (i, o)
+    for i, edge in enumerate(EDGES)
+    for o in range(2)
+}
+# Stickers of all corners (edges), slot after slot
+_CORNER_STICKERS = itemgetter(*(f for slot in CORNER_FACELETS for f in slot))
+_EDGE_STICKERS = itemgetter(*(f for slot in EDGE_FACELETS for f in slot))
+
+
+class InvalidCubeError(ValueError):
+    pass
+
+
+def validate(cube_str):
+    """
+    :param cube_str: Stickers in the layout of Cube.__post_init__, the
+    faces are identified by the colors of their centers
+    :return: The CubieCube of cube_str
+    :raises InvalidCubeError: with the reason if cube_str is not solvable
+    """
+    if len(cube_str) != 54:
+        cube_str = "".join(x for x in cube_str if x not in string.whitespace)
+    if len(cube_str) != 54:
+        raise InvalidCubeError(f"Expected 54 stickers, got {len(cube_str)}")
+
+    colors = center_colors(cube_str)
+    if len(set(colors.values())) != 6:
+        raise InvalidCubeError(
+            f"The centers must have 6 different colors, got "
+            f"{''.join(colors[face] for face in FACES)}"
+        )
+    counts = [cube_str.count(color) for color in colors.values()]
+    if counts != [9] * 6:
+        stray = sorted(set(cube_str).difference(colors.values()))
+        if stray:
+            raise InvalidCubeError(f"Color {stray[0]} is not on any center")
+        for color, n in zip(colors.values(), counts):
+            if n != 9:
+                raise InvalidCubeError(
+                    f"Color {color} is on {n} stickers, not 9"
+                )
+
+    faces = cube_str.translate(
+        str.maketrans("".join(colors.values()), "".join(colors))
+    )
+    cp, co = _pieces("".join(_CORNER_STICKERS(faces)), CORNERS, _CORNERS)
+    ep, eo = _pieces("".join(_EDGE_STICKERS(faces)), EDGES, _EDGES)
+
+    if sum(co) % 3:
+        raise InvalidCubeError("A corner is twisted")
+    if sum(eo) % 2:
+        raise InvalidCubeError("An edge is flipped")
+    if permutation_parity(cp) != permutation_parity(ep):
+        raise InvalidCubeError("Two pieces are swapped")
+    return CubieCube(cp, co, ep, eo)
+
+
+def _pieces(stickers, names, pieces):
+    """
+    :param stickers: Faces of the stickers of all slots
+    :param names: CORNERS or EDGES
+    :param pieces: _CORNERS or _EDGES
+    :return: Permutation and orientation of the pieces
+    """
+    kind = "corner" if names is CORNERS else "edge"
+    size = len(names[0])
+    permutation, orientation = [], []
+    for slot, start in enumerate(range(0, len(stickers), size)):
+        end = start + size
+        try:
+            piece, o = pieces[stickers[start:end]]
+        except KeyError:
+            raise InvalidCubeError(
+                f"There is no {kind} {stickers[start:end]} "
+                f"(in the {names[slot]} slot)"
+            ) from None
+        if piece in permutation:
+            raise InvalidCubeError(f"The {kind} {names[piece]} is twice")
+        permutation.append(piece)
+        orientation.append(o)
+    return permutation, orientation
+
+
+def is_solvable(cube_str):
+    try:
+        validate(cube_str)
+    except InvalidCubeError:
+        return False
+    return True
@@ -0,0 +1,114 @@
+"""Solve many cubes in parallel worker processes."""
+
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass
+from typing import List, Optional
+
+from game.cube import Cube
+from game.validation import validate
+from solving_methods.solver import Solver
+
+
+@dataclass
+class SolveResult:
+    index: int
+    cube_str: str
+    moves: Optional[List[str]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _solve(index, cube_str, solver, cube_type):
+    try:
+        validate(cube_str)
+        cube = cube_type(cube_str)
+        method = solver(cube)
+        method.solve()
+        if not method.cube.is_solved():
+            raise Exception("Not solved:\n" + str(method.cube))
+        return SolveResult(index, cube_str, moves=method.moves)
+    except Exception as e:
+        return SolveResult(index, cube_str, error=f"{type(e).__name__}: {e}")
+
+
+def _solve_chunk(chunk, solver, cube_type):
+    return [_solve(i, s, solver, cube_type) for i, s in chunk]
+
+
+def _chunks(cube_strs, chunksize):
+    chunk = []
+    for item in enumerate(cube_strs):
+        chunk.append(item)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_many(
+    cube_strs,
+    workers=None,
+    chunksize=16,
+    ordered=True,
+    solver=Solver,
+    cube_type=Cube,
+):
+    """
+    Solve every cube in cube_strs. A cube which can not be solved does not
+    stop the batch, its SolveResult has the exception in error instead.
+
+    :param cube_strs: An iterable of cube strings
+    :param workers: Number of worker processes, os.cpu_count() if None.
+    With workers=1 the cubes are solved in this process.
+    :param chunksize: Number of cubes sent to a worker at once. At most
+    2 * workers chunks are queued, cube_strs is consumed as they finish.
+    :param ordered: Yield the results in the order of cube_strs, otherwise
+    as they are completed
+    :param solver: Solver class, constructed with the cube and having
+    solve() and moves. Must be importable by the worker processes.
+    :param cube_type: Class constructed from a cube string, Cube or
+    FaceletCube
+    :return: An iterator of SolveResult
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    chunks = _chunks(cube_strs, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _solve_chunk(chunk, solver, cube_type)
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # at most 2 * workers chunks are in flight, so cube_strs is read
+        # lazily and only their results are held in memory
+        pending = deque() if ordered else set()
+        for chunk in chunks:
+            future = executor.submit(_solve_chunk, chunk, solver, cube_type)
+            if ordered:
+                pending.append(future)
+                if len(pending) > 2 * workers:
+                    yield from pending.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) > 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+        if ordered:
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            for future in as_completed(pending):
+                yield from future.result()
@@ -0,0 +1,176 @@
+"""Optimal solutions for states close to solved.
+
+A breadth-first search runs from the cube and one from the solved state,
+always growing the smaller frontier by a whole layer, until the two meet.
+Each side only needs to reach half the distance, so a state 8 face turns
+from solved costs two searches of depth 4 instead of one of depth 8.
+The states are stored under their state_key, with the last move that
+reached them. Beyond max_depth another solver takes over.
+
+With an EndgameTable, the search from the solved state is replaced by
+the table: the search from the cube stops at the first layer which
+reaches the table.
+"""
+
+import numpy as np
+
+from game.validation import validate
+from solving_methods.coordinates import (
+    KEY_MOVES,
+    NEXT_MOVES,
+    SOLVED_KEY,
+    START,
+    inverse_move,
+    move_tokens,
+    state_key,
+)
+from solving_methods.optimal import SearchLimitError
+from solving_methods.two_phase import TwoPhaseSolver
+
+
+class BidirectionalSolver:
+    def __init__(
+        self, cube, max_depth=10, fallback=TwoPhaseSolver, endgame=None
+    ):
+        """
+        :param cube: A Cube, FaceletCube or anything with flat_str()
+        and sequence()
+        :param max_depth: The most face turns searched for
+        :param fallback: A solver class for cubes further than max_depth
+        from solved, constructed with the cube. None to raise
+        SearchLimitError instead.
+        :param endgame: An EndgameTable to search towards instead of the
+        solved state
+        """
+        self.cube = cube
+        self.moves = []
+        self.max_depth = max_depth
+        self.fallback = fallback
+        self.endgame = endgame
+        # The number of states stored by the search
+        self.nodes = 0
+        self.used_fallback = False
+
+    def solve(self):
+        """
+        Find an optimal solution, record it in moves as in Solver (a half
+        turn as two quarter turns) and apply it to the cube.
+
+        :raises InvalidCubeError: if the cube is not solvable
+        :raises SearchLimitError: if the cube is further than max_depth
+        from solved and there is no fallback
+        """
+        cubie_cube = validate(self.cube.flat_str())
+        search = _Search(state_key(cubie_cube))
+        if self.endgame is None:
+            solution = search.run(self.max_depth)
+        else:
+            solution = search.run_to_endgame(self.max_depth, self.endgame)
+        self.nodes = search.nodes
+        if solution is None:
+            if self.fallback is None:
+                raise SearchLimitError(
+                    f"No solution with at most {self.max_depth} face turns",
+                    self.nodes,
+                    self.max_depth + 1,
+                )
+            self.used_fallback = True
+            solver = self.fallback(self.cube)
+            solver.solve()
+            self.moves = solver.moves
+            return
+        for move in solution:
+            self.moves.extend(move_tokens(move))
+        self.cube.sequence(" ".join(self.moves))
+
+
+class _Search:
+    def __init__(self, start):
+        self.start = start
+        # for both sides the last move to every state, START at the start
+        self.forward = {start: START}
+        self.backward = {SOLVED_KEY: START}
+        self.forward_frontier = [start]
+        self.backward_frontier = [SOLVED_KEY]
+
+    @property
+    def nodes(self):
+        return len(self.forward) + len(self.backward)
+
+    def run(self, max_depth):
+        """
+        :return: An optimal solution as a list of indices of FACE_TURNS,
+        None if there is none with at most max_depth moves
+        """
+        if SOLVED_KEY in self.forward:
+            return []
+        for _ in range(max_depth):
+            if len(self.forward_frontier) <= len(self.backward_frontier):
+                self.forward_frontier, meeting = _expand(
+                    self.forward_frontier, self.forward, self.backward
+                )
+            else:
+                self.backward_frontier, meeting = _expand(
+                    self.backward_frontier, self.backward, self.forward
+                )
+            if meeting is not None:
+                backward = _path(meeting, self.backward)
+                return _path(meeting, self.forward)[::-1] + [
+                    inverse_move(m) for m in backward
+                ]
+        return None
+
+    def run_to_endgame(self, max_depth, endgame):
+        """
+        While no state of a layer is in the table, all of them are more
+        than endgame.depth from solved, so every state of the first layer
+        which reaches the table is on a shortest path.
+
+        :return: An optimal solution as a list of indices of FACE_TURNS,
+        None if there is none with at most max_depth moves
+        """
+        frontier = [self.start]
+        for depth in range(max(max_depth - endgame.depth, 0) + 1):
+            if depth:
+                frontier, _ = _expand(frontier, self.forward, {})
+            hits = np.flatnonzero(endgame.last_moves(frontier) >= 0)
+            if len(hits):
+                key = frontier[hits[0]]
+                path = _path(key, self.forward)[::-1]
+                solution = path + endgame.solution(key)
+                return solution if len(solution) <= max_depth else None
+        return None
+
+
+def _expand(frontier, visited, other):
+    """
+    Add the next layer of a search to visited. While the searches have
+    not met, every state of other has a distance of at least the depth
+    of other to the states of this layer, so the first meeting is on a
+    shortest path.
+
+    :return: The new frontier and the state where the searches meet, or
+    None
+    """
+    layer = []
+    for key in frontier:
+        for m in NEXT_MOVES[visited[key]]:
+            new = key.translate(KEY_MOVES[m])
+            if new in visited:
+                continue
+            visited[new] = m
+            if new in other:
+                return layer, new
+            layer.append(new)
+    return layer, None
+
+
+def _path(key, visited):
+    """:return: The moves leading to key, the last move first"""
+    moves = []
+    move = visited[key]
+    while move != START:
+        moves.append(move)
+        key = key.translate(KEY_MOVES[inverse_move(move)])
+        move = visited[key]
+    return moves
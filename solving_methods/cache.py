@@ -0,0 +1,118 @@
+"""A cache of solutions in front of the solvers.
+
+Solutions are stored for the canonical form of a state (see
+game.symmetry), so a cube which is a rotated, mirrored or recolored
+version of a cached one is a cache hit as well. The cached moves are
+mapped back to the orientation of the cube asked for.
+"""
+
+import sqlite3
+from collections import OrderedDict
+
+from game.facelet_cube import FaceletCube
+from game.symmetry import canonical_form
+from solving_methods.solver import Solver
+
+
+class SolutionCache:
+    def __init__(
+        self,
+        solver=Solver,
+        max_entries=100_000,
+        max_bytes=None,
+        path=None,
+        cube_type=FaceletCube,
+    ):
+        """
+        :param solver: Solver class, constructed with the cube and having
+        solve() and moves
+        :param max_entries: Number of solutions kept in memory
+        :param max_bytes: If given, the size in bytes of the states and
+        moves kept in memory
+        :param path: If given, an SQLite file which stores all solutions,
+        also across restarts
+        :param cube_type: Class of the cubes the solver works on
+        """
+        self.solver = solver
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cube_type = cube_type
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path))
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(state TEXT PRIMARY KEY, moves TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def solve(self, cube):
+        """
+        :param cube: A Cube, FaceletCube or cube_str, it is not changed
+        :return: The moves solving cube
+        """
+        canonical, symmetry = canonical_form(cube)
+        moves = self._get(canonical)
+        if moves is None:
+            self.misses += 1
+            solver = self.solver(self.cube_type(canonical))
+            solver.solve()
+            moves = " ".join(solver.moves)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                    (canonical, moves),
+                )
+                self._db.commit()
+            self._put(canonical, moves)
+        else:
+            self.hits += 1
+        return symmetry.map_moves(moves.split())
+
+    def _get(self, canonical):
+        moves = self._entries.get(canonical)
+        if moves is not None:
+            self._entries.move_to_end(canonical)
+            return moves
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT moves FROM solutions WHERE state = ?", (canonical,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._put(canonical, row[0])
+        return row[0]
+
+    def _put(self, canonical, moves):
+        self._entries[canonical] = moves
+        self.nbytes += _size(canonical, moves)
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or self.max_bytes is not None
+            and self.nbytes > self.max_bytes
+        ):
+            state, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _size(state, evicted)
+
+
+def _size(canonical, moves):
+    return len(canonical) + len(moves)
@@ -0,0 +1,583 @@
+"""Coordinates and move tables for table driven solving methods.
+
+Every table maps (coordinate, move) to the coordinate after the move,
+where the moves are the 18 face turns of FACE_TURNS. The tables are
+generated for all coordinates at once with numpy.
+"""
+
+from itertools import combinations, permutations
+from math import factorial
+
+import numpy as np
+
+from game.cubie_cube import CubieCube, FACES, permutation_rank
+
+# The 18 face turns as (face, number of clockwise quarter turns),
+# ordered by face as in FACES.
+FACE_TURNS = tuple((face, power) for face in FACES for power in (1, 2, 3))
+N_MOVES = len(FACE_TURNS)
+
+# Face turns which keep a cube in the subgroup <U, D, R2, L2, F2, B2>
+PHASE2_MOVES = tuple(
+    m
+    for m, (face, power) in enumerate(FACE_TURNS)
+    if face in "UD" or power == 2
+)
+
+# Face turns which keep a cube in the subgroup <U2, D2, R2, L2, F2, B2>
+HALF_TURN_MOVES = tuple(
+    m for m, (_, power) in enumerate(FACE_TURNS) if power == 2
+)
+
+N_TWIST = 3**7
+N_FLIP = 2**11
+N_SLICE = 495
+N_CORNER_PERMUTATION = factorial(8)
+N_UD_EDGE_PERMUTATION = factorial(8)
+N_SLICE_PERMUTATION = factorial(4)
+N_SLICE_PERMUTATIONS = N_SLICE_PERMUTATION**3
+N_HALF_TURN_CORNERS = 96
+N_CORNER_COSET = N_CORNER_PERMUTATION // N_HALF_TURN_CORNERS
+
+# Number of states expanded at once by PieceGroup.pruning_table
+_CHUNK = 1 << 21
+
+# The edges FR, FL, BL, BR of the UD slice
+SLICE_EDGES = (8, 9, 10, 11)
+# The edges UF, UB, DF, DB of the M slice
+M_SLICE_EDGES = (1, 3, 5, 7)
+# The edges UR, UL, DR, DL of the S slice
+S_SLICE_EDGES = (0, 2, 4, 6)
+_SLICES = (SLICE_EDGES, M_SLICE_EDGES, S_SLICE_EDGES)
+# The position of every edge among the edges of its slice
+_SLICE_SLOT = np.zeros(12, dtype=np.int8)
+for _edges in _SLICES:
+    _SLICE_SLOT[list(_edges)] = range(4)
+
+# All sets of 4 edge positions, the solved set (8, 9, 10, 11) first
+_SLICE_POSITIONS = tuple(combinations(range(11, -1, -1), 4))
+_SLICE_INDEX = np.full(1 << 12, -1, dtype=np.int32)
+for _i, _positions in enumerate(_SLICE_POSITIONS):
+    _SLICE_INDEX[sum(1 << p for p in _positions)] = _i
+
+
+def move_tokens(move):
+    """
+    :param move: Index into FACE_TURNS
+    :return: The move in the notation of Cube.sequence,
+    a half turn is two quarter turns
+    """
+    face, power = FACE_TURNS[move]
+    return {1: (face,), 2: (face, face), 3: (face + "i",)}[power]
+
+
+def allowed(move, previous):
+    """
+    No two turns of the same face in a row, and turns of opposite faces
+    only in the order of FACES.
+
+    :param move: Index into FACE_TURNS
+    :param previous: The move before, None at the start
+    """
+    if previous is None:
+        return True
+    face = move // 3
+    previous_face = previous // 3
+    return face != previous_face and face != previous_face - 3
+
+
+# The previous move of the first move of a sequence
+START = N_MOVES
+
+
+def next_moves(moves=range(N_MOVES)):
+    """
+    :param moves: Indices into FACE_TURNS
+    :return: For every previous move, and for START, the moves of moves
+    which may follow it
+    """
+    return tuple(
+        tuple(m for m in moves if allowed(m, previous))
+        for previous in (*range(N_MOVES), None)
+    )
+
+
+def canonical_sequences(length, moves=range(N_MOVES)):
+    """
+    Generate the move sequences of the given length without redundancy:
+    no two turns of the same face in a row and turns of opposite faces
+    only in the order of FACES. Every state reached with length moves
+    is reached by one of them. There are about 13.35 times as many of
+    length n + 1 as of length n, instead of 18 times.
+
+    :param moves: Indices into FACE_TURNS
+    :return: A generator of tuples of indices into FACE_TURNS
+    """
+    following = next_moves(moves)
+    sequence = []
+
+    def extend(previous, togo):
+        if togo == 0:
+            yield tuple(sequence)
+            return
+        for m in following[previous]:
+            sequence.append(m)
+            yield from extend(m, togo - 1)
+            sequence.pop()
+
+    return extend(START, length)
+
+
+def inverse_move(move):
+    """:return: The index of the inverse of a move of FACE_TURNS"""
+    return move - move % 3 + 2 - move % 3
+
+
+NEXT_MOVES = next_moves()
+# ALLOWED_NEXT[previous][move] for every previous move and START
+ALLOWED_NEXT = tuple(
+    tuple(m in following for m in range(N_MOVES)) for following in NEXT_MOVES
+)
+
+
+def _move_cubes():
+    cubes = []
+    for face, power in FACE_TURNS:
+        cube = CubieCube()
+        for _ in range(power):
+            cube.move(face)
+        cubes.append(cube)
+    return tuple(cubes)
+
+
+MOVE_CUBES = _move_cubes()
+
+
+def state_key(cube):
+    """
+    A compact key of the state of a CubieCube: a byte for every corner
+    with slot * 3 + orientation and for every edge with
+    24 + slot * 2 + orientation. A move maps every byte to a byte
+    independent of the piece, so key.translate(KEY_MOVES[m]) is the key
+    after the move.
+    """
+    key = bytearray(20)
+    for slot, (piece, orientation) in enumerate(zip(cube.cp, cube.co)):
+        key[piece] = slot * 3 + orientation
+    for slot, (piece, orientation) in enumerate(zip(cube.ep, cube.eo)):
+        key[8 + piece] = 24 + slot * 2 + orientation
+    return bytes(key)
+
+
+def _key_moves():
+    tables = []
+    for move in MOVE_CUBES:
+        table = bytearray(range(256))
+        # the piece in slot s moves to slot t
+        for t, (s, o) in enumerate(zip(move.cp, move.co)):
+            for orientation in range(3):
+                table[s * 3 + orientation] = t * 3 + (orientation + o) % 3
+        for t, (s, o) in enumerate(zip(move.ep, move.eo)):
+            for orientation in range(2):
+                table[24 + s * 2 + orientation] = (
+                    24 + t * 2 + (orientation + o) % 2
+                )
+        tables.append(bytes(table))
+    return tuple(tables)
+
+
+KEY_MOVES = _key_moves()
+SOLVED_KEY = state_key(CubieCube())
+
+
+def twist(cube):
+    return cube.corner_orientation
+
+
+def flip(cube):
+    return cube.edge_orientation
+
+
+def slice_coordinate(cube, edges=SLICE_EDGES):
+    """
+    :param edges: 4 edges, by default the UD slice edges
+    :return: 0 <= slice < 495, the positions of the edges,
+    0 if they are in the UD slice
+    """
+    mask = sum(1 << i for i, e in enumerate(cube.ep) if e in edges)
+    return int(_SLICE_INDEX[mask])
+
+
+def corner_permutation(cube):
+    return cube.corner_permutation
+
+
+def ud_edge_permutation(cube):
+    """
+    :return: 0 <= ud_edge_permutation < 8!, the permutation of the UP and
+    DOWN edges. Only defined if the UD slice edges are in the UD slice.
+    """
+    return permutation_rank(cube.ep[:8])
+
+
+def slice_permutation(cube):
+    """
+    :return: 0 <= slice_permutation < 4!, the permutation of the UD slice
+    edges. Only defined if they are in the UD slice.
+    """
+    return permutation_rank([e - 8 for e in cube.ep[8:]])
+
+
+def slice_permutations(cube):
+    """
+    :return: 0 <= slice_permutations < 24**3, the permutations of the
+    edges of the UD, M and S slices. Only defined if every edge is in its
+    slice.
+    """
+    coordinate = 0
+    for edges in _SLICES:
+        rank = permutation_rank([_SLICE_SLOT[cube.ep[s]] for s in edges])
+        coordinate = coordinate * N_SLICE_PERMUTATION + rank
+    return coordinate
+
+
+def _rank_rows(perms):
+    n = perms.shape[1]
+    ranks = np.zeros(len(perms), dtype=np.int64)
+    for i in range(n - 1):
+        smaller = sum(perms[:, j] < perms[:, i] for j in range(i + 1, n))
+        ranks += smaller * factorial(n - 1 - i)
+    return ranks
+
+
+def _orientation_rows(n_coordinates, base, n):
+    coordinates = np.arange(n_coordinates)
+    rows = np.zeros((n_coordinates, n), dtype=np.int64)
+    for i in range(n - 2, -1, -1):
+        rows[:, i] = coordinates % base
+        coordinates = coordinates // base
+    rows[:, -1] = -rows[:, :-1].sum(axis=1) % base
+    return rows
+
+
+def _orientation_coordinates(rows, base):
+    coordinates = np.zeros(len(rows), dtype=np.int64)
+    for i in range(rows.shape[1] - 1):
+        coordinates = coordinates * base + rows[:, i]
+    return coordinates
+
+
+def _table(n_coordinates, apply, moves=range(N_MOVES)):
+    """
+    :param apply: Maps an array of all coordinates and a move cube to the
+    array of coordinates after the move
+    :return: The (n_coordinates, N_MOVES) move table, -1 for moves
+    which are not in moves
+    """
+    table = np.full((n_coordinates, N_MOVES), -1, dtype=np.int32)
+    for m in moves:
+        table[:, m] = apply(MOVE_CUBES[m])
+    return table
+
+
+def twist_move_table():
+    rows = _orientation_rows(N_TWIST, 3, 8)
+    return _table(
+        N_TWIST,
+        lambda move: _orientation_coordinates(
+            (rows[:, list(move.cp)] + move.co) % 3, 3
+        ),
+    )
+
+
+def flip_move_table():
+    rows = _orientation_rows(N_FLIP, 2, 12)
+    return _table(
+        N_FLIP,
+        lambda move: _orientation_coordinates(
+            (rows[:, list(move.ep)] + move.eo) % 2, 2
+        ),
+    )
+
+
+def slice_move_table():
+    rows = np.zeros((N_SLICE, 12), dtype=np.int64)
+    for i, positions in enumerate(_SLICE_POSITIONS):
+        rows[i, list(positions)] = 1
+    weights = 1 << np.arange(12)
+    return _table(
+        N_SLICE,
+        lambda move: _SLICE_INDEX[(rows[:, list(move.ep)] * weights).sum(1)],
+    )
+
+
+def corner_permutation_move_table():
+    rows = np.array(list(permutations(range(8))), dtype=np.int8)
+    return _table(
+        N_CORNER_PERMUTATION, lambda move: _rank_rows(rows[:, list(move.cp)])
+    )
+
+
+def ud_edge_permutation_move_table():
+    rows = np.array(list(permutations(range(8))), dtype=np.int8)
+    return _table(
+        N_UD_EDGE_PERMUTATION,
+        lambda move: _rank_rows(rows[:, list(move.ep[:8])]),
+        PHASE2_MOVES,
+    )
+
+
+def slice_permutation_move_table():
+    rows = np.array(list(permutations(range(4))), dtype=np.int8)
+    return _table(
+        N_SLICE_PERMUTATION,
+        lambda move: _rank_rows(rows[:, [e - 8 for e in move.ep[8:]]]),
+        PHASE2_MOVES,
+    )
+
+
+def slice_permutations_move_table():
+    perms = np.array(list(permutations(range(4))), dtype=np.int8)
+    rows = np.zeros((N_SLICE_PERMUTATIONS, 12), dtype=np.int8)
+    codes = np.arange(N_SLICE_PERMUTATIONS)
+    for edges in reversed(_SLICES):
+        rows[:, list(edges)] = np.array(edges)[perms[codes % 24]]
+        codes = codes // 24
+
+    def apply(move):
+        moved = rows[:, list(move.ep)]
+        coordinates = np.zeros(len(rows), dtype=np.int64)
+        for edges in _SLICES:
+            ranks = _rank_rows(_SLICE_SLOT[moved[:, list(edges)]])
+            coordinates = coordinates * N_SLICE_PERMUTATION + ranks
+        return coordinates
+
+    return _table(N_SLICE_PERMUTATIONS, apply, HALF_TURN_MOVES)
+
+
+def half_turn_corner_permutations():
+    """
+    :return: The sorted ranks of the 96 corner permutations which can be
+    reached with half turns
+    """
+    solved = tuple(range(8))
+    found = {solved}
+    frontier = [solved]
+    while frontier:
+        reached = []
+        for perm in frontier:
+            for m in HALF_TURN_MOVES:
+                moved = tuple(perm[i] for i in MOVE_CUBES[m].cp)
+                if moved not in found:
+                    found.add(moved)
+                    reached.append(moved)
+        frontier = reached
+    return np.sort(_rank_rows(np.array(sorted(found))))
+
+
+def half_turn_corner_table():
+    """
+    :return: For every corner permutation its index among
+    half_turn_corner_permutations(), -1 if it can't be reached with half
+    turns
+    """
+    table = np.full(N_CORNER_PERMUTATION, -1, dtype=np.int16)
+    table[half_turn_corner_permutations()] = np.arange(N_HALF_TURN_CORNERS)
+    return table
+
+
+def half_turn_corner_move_table(half_turn_corners):
+    """:param half_turn_corners: The half_turn_corner_table()"""
+    rows = np.array(list(permutations(range(8))), dtype=np.int8)
+    rows = rows[half_turn_corner_permutations()]
+    return _table(
+        N_HALF_TURN_CORNERS,
+        lambda move: half_turn_corners[_rank_rows(rows[:, list(move.cp)])],
+        HALF_TURN_MOVES,
+    )
+
+
+def corner_coset_table():
+    """
+    The corner permutations p form 420 cosets H p of the group H of the 96
+    permutations which can be reached with half turns. The coset after a
+    move only depends on the coset before.
+
+    :return: For every corner permutation its coset, 0 for H itself
+    """
+    rows = np.array(list(permutations(range(8))), dtype=np.int8)
+    group = rows[half_turn_corner_permutations()]
+    smallest = np.min([_rank_rows(h[rows]) for h in group], axis=0)
+    return np.unique(smallest, return_inverse=True)[1].astype(np.int16)
+
+
+def corner_coset_move_table(corner_cosets):
+    """:param corner_cosets: The corner_coset_table()"""
+    rows = np.array(list(permutations(range(8))), dtype=np.int8)
+    rows = rows[np.unique(corner_cosets, return_index=True)[1]]
+    return _table(
+        N_CORNER_COSET,
+        lambda move: corner_cosets[_rank_rows(rows[:, list(move.cp)])],
+    )
+
+
+def pruning_table(table_a, table_b, moves=range(N_MOVES), start=0):
+    """
+    :param table_a: Move table of a coordinate a
+    :param table_b: Move table of a coordinate b
+    :param start: The index of the goal
+    :return: For every index a * len(table_b) + b the number of moves
+    needed to bring both coordinates to the goal, by default both to 0
+    """
+    n_b = len(table_b)
+    distances = np.full(len(table_a) * n_b, -1, dtype=np.int8)
+    distances[start] = 0
+    depth = 0
+    frontier = np.array([start], dtype=np.int64)
+    while len(frontier):
+        a, b = np.divmod(frontier, n_b)
+        for m in moves:
+            neighbours = table_a[a, m].astype(np.int64) * n_b + table_b[b, m]
+            distances[neighbours[distances[neighbours] == -1]] = depth + 1
+        depth += 1
+        frontier = np.flatnonzero(distances == depth)
+    return distances
+
+
+def _arrangements(n, k):
+    """:return: Number of ordered arrangements of k of n items"""
+    return factorial(n) // factorial(n - k)
+
+
+class PieceGroup:
+    """A coordinate of a group of corners or of edges.
+
+    The coordinate is position * n_orientations + orientation, where
+    position ranks the slots of the pieces, in the order of pieces, among
+    all arrangements of len(pieces) of the slots, and orientation holds the
+    orientation of each piece as a digit, the first piece least
+    significant. A group of 7 corners or 11 edges determines the last one.
+    """
+
+    def __init__(self, kind, pieces):
+        """
+        :param kind: "corner" or "edge"
+        :param pieces: Numbers of the corners or edges, as in CORNERS or
+        EDGES
+        """
+        if kind not in ("corner", "edge"):
+            raise ValueError(f"Unknown kind of pieces: {kind}")
+        self.kind = kind
+        self.pieces = tuple(pieces)
+        self.n_slots, self.base = (8, 3) if kind == "corner" else (12, 2)
+        self.n_positions = _arrangements(self.n_slots, len(self.pieces))
+        self.n_orientations = self.base ** len(self.pieces)
+
+    def __len__(self):
+        return self.n_positions * self.n_orientations
+
+    def __repr__(self):
+        return f"PieceGroup({self.kind!r}, {self.pieces})"
+
+    def _arrays(self, cube):
+        if self.kind == "corner":
+            return cube.cp, cube.co
+        return cube.ep, cube.eo
+
+    def _rank(self, slots):
+        """:param slots: An array with a row of slots per arrangement"""
+        k = slots.shape[1]
+        ranks = np.zeros(len(slots), dtype=np.int64)
+        for i in range(k):
+            smaller = sum(slots[:, j] < slots[:, i] for j in range(i))
+            weight = _arrangements(self.n_slots - 1 - i, k - 1 - i)
+            ranks += (slots[:, i] - smaller) * weight
+        return ranks
+
+    def _encode(self, orientations):
+        weights = self.base ** np.arange(orientations.shape[1])
+        return (orientations * weights).sum(axis=1)
+
+    def coordinate(self, cube):
+        """:param cube: A CubieCube"""
+        permutation, orientation = self._arrays(cube)
+        slots = [permutation.index(piece) for piece in self.pieces]
+        position = self._rank(np.array([slots]))[0]
+        digits = np.array([[orientation[s] for s in slots]])
+        orientation = self._encode(digits)[0]
+        return int(position) * self.n_orientations + int(orientation)
+
+    def _moved_slots(self):
+        """
+        :return: For every move an array with, for every position, the
+        slots the pieces move to, and the orientation the move adds to
+        the pieces in each slot
+        """
+        slots = np.array(
+            list(permutations(range(self.n_slots), len(self.pieces))),
+            dtype=np.int64,
+        )
+        for move in MOVE_CUBES:
+            permutation, orientation = self._arrays(move)
+            # the piece in slot s moves to slot target[s]
+            target = np.argsort(permutation)
+            yield target[slots], np.asarray(orientation)
+
+    def position_move_table(self):
+        """:return: The (n_positions, N_MOVES) move table of the position"""
+        table = np.zeros((self.n_positions, N_MOVES), dtype=np.int32)
+        for m, (moved, _) in enumerate(self._moved_slots()):
+            table[:, m] = self._rank(moved)
+        return table
+
+    def orientation_change_table(self):
+        """
+        :return: The (n_positions, N_MOVES) table of the orientation a move
+        adds to the pieces of the group in a position
+        """
+        table = np.zeros((self.n_positions, N_MOVES), dtype=np.int16)
+        for m, (moved, orientation) in enumerate(self._moved_slots()):
+            table[:, m] = self._encode(orientation[moved])
+        return table
+
+    def orientation_add_table(self):
+        """
+        :return: The (n_orientations, n_orientations) table of the sum of
+        two orientations
+        """
+        n = self.n_orientations
+        table = np.zeros((n, n), dtype=np.int16)
+        codes = np.arange(n)
+        for i in range(len(self.pieces)):
+            digits = codes // self.base**i % self.base
+            table += ((digits[:, None] + digits[None, :]) % self.base) * (
+                self.base**i
+            )
+        return table
+
+    def pruning_table(
+        self, position_move, orientation_change, orientation_add
+    ):
+        """
+        :return: For every coordinate the number of face turns needed to
+        bring the pieces of the group home
+        """
+        n = self.n_orientations
+        start = self.coordinate(CubieCube())
+        distances = np.full(len(self), -1, dtype=np.int8)
+        distances[start] = 0
+        depth = 0
+        frontier = np.array([start], dtype=np.int64)
+        while len(frontier):
+            for chunk in range(0, len(frontier), _CHUNK):
+                position, orientation = np.divmod(frontier[chunk:][:_CHUNK], n)
+                for m in range(N_MOVES):
+                    change = orientation_change[position, m]
+                    neighbours = position_move[position, m].astype(np.int64)
+                    neighbours *= n
+                    neighbours += orientation_add[change, orientation]
+                    new = neighbours[distances[neighbours] == -1]
+                    distances[new] = depth + 1
+            depth += 1
+            frontier = np.flatnonzero(distances == depth)
+        return distances
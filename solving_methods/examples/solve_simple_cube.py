@@ -1,4 +1,5 @@
 from game.cube import Cube
+from solving_methods.optimizer import optimize
 from solving_methods.solver import Solver
 
 c = Cube("DLURRDFFUBBLDDRBRBLDLRBFRUULFBDDUFBRBBRFUDFLUDLUULFLFR")
@@ -13,3 +14,10 @@ print(f"{len(solver.moves)} moves: {' '.join(solver.moves)}")
 check = Cube(orig)
 check.sequence(" ".join(solver.moves))
 assert check.is_solved()
+
+moves = optimize(solver.moves, expand_slices=True)
+print(f"{len(moves)} moves optimized: {' '.join(moves)}")
+
+check = Cube(orig)
+check.sequence(" ".join(moves))
+assert check.is_solved()
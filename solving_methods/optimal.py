@@ -0,0 +1,341 @@
+"""Optimal solutions with iterative deepening A* (IDA*).
+
+The search runs on the cubie level: the state is the coordinate of a few
+groups of pieces (see coordinates.PieceGroup), by default one group of 7
+corners and two groups of 6 edges, which together determine the cube.
+For every group a pattern database holds the number of face turns needed
+to bring its pieces home, a lower bound for the whole cube. The heuristic
+is the maximum of these bounds, so the first solution found is an optimal
+one in the face turn metric.
+
+The default databases are Korf's. With their move tables they take about
+330 MB, are generated on first use in one to two minutes and then
+memory-mapped from table_dir. Smaller groups give smaller tables but a
+weaker heuristic.
+
+With an EndgameTable (see endgame.py) the search also follows the
+state_key of the cube. Once at most the depth of the table is left, the
+table gives the exact distance: a state in the table is solved by its
+solution if that is short enough, any other state is too far away. So
+the last moves of every path cost one lookup of all children of a state
+instead of a search, and the search starts at depth + 1 unless the cube
+is in the table.
+"""
+
+import time
+import zlib
+from pathlib import Path
+
+from game.validation import validate
+from solving_methods.coordinates import (
+    KEY_MOVES,
+    NEXT_MOVES,
+    N_MOVES,
+    START,
+    PieceGroup,
+    move_tokens,
+    state_key,
+)
+from solving_methods.table_store import TableStore
+from solving_methods.two_phase import DEFAULT_TABLE_DIR
+
+CORNER_GROUPS = ((0, 1, 2, 3, 4, 5, 6),)
+EDGE_GROUPS = ((0, 1, 2, 3, 4, 5), (6, 7, 8, 9, 10, 11))
+TABLE_VERSION = "optimal-1"
+
+# Nodes between two checks of the time limit
+_CLOCK_INTERVAL = 1024
+
+
+class SearchLimitError(Exception):
+    """The node or time limit was reached before a solution was found."""
+
+    def __init__(self, message, nodes, lower_bound):
+        super().__init__(message)
+        self.nodes = nodes
+        self.lower_bound = lower_bound
+
+
+def piece_groups(corner_groups=CORNER_GROUPS, edge_groups=EDGE_GROUPS):
+    """
+    :return: The PieceGroups of the pattern databases
+    :raises ValueError: if the groups do not determine the cube
+    """
+    corners = {c for group in corner_groups for c in group}
+    edges = {e for group in edge_groups for e in group}
+    if len(corners) < 7 or len(edges) < 11:
+        raise ValueError(
+            "The groups must contain at least 7 corners and 11 edges"
+        )
+    return [PieceGroup("corner", g) for g in corner_groups] + [
+        PieceGroup("edge", g) for g in edge_groups
+    ]
+
+
+def _builders(groups):
+    builders = {}
+    for i, group in enumerate(groups):
+        builders.update(
+            {
+                f"{i}_position_move": _build(group.position_move_table),
+                f"{i}_orientation_change": _build(
+                    group.orientation_change_table
+                ),
+                f"{i}_orientation_add": _build(group.orientation_add_table),
+                f"{i}_prune": _pruning(group, i),
+            }
+        )
+    return builders
+
+
+def _build(method):
+    return lambda _: method()
+
+
+def _pruning(group, i):
+    return lambda tables: group.pruning_table(
+        tables[f"{i}_position_move"],
+        tables[f"{i}_orientation_change"],
+        tables[f"{i}_orientation_add"],
+    )
+
+
+_stores = {}
+
+
+def load_tables(
+    table_dir=None, corner_groups=CORNER_GROUPS, edge_groups=EDGE_GROUPS
+):
+    """
+    The tables of every choice of groups are stored in a file of their
+    own in table_dir. They are generated on first use, later calls (also
+    in other processes) memory-map them.
+
+    :return: A TableStore with the tables
+    """
+    groups = piece_groups(corner_groups, edge_groups)
+    table_dir = Path(table_dir or DEFAULT_TABLE_DIR)
+    key = (table_dir, repr(groups))
+    if key not in _stores:
+        name = f"optimal-{zlib.crc32(repr(groups).encode()):08x}.tbl"
+        _stores[key] = TableStore(
+            table_dir / name, _builders(groups), f"{TABLE_VERSION} {groups}"
+        )
+    return _stores[key]
+
+
+class OptimalSolver:
+    def __init__(
+        self,
+        cube,
+        max_nodes=None,
+        timeout=None,
+        corner_groups=CORNER_GROUPS,
+        edge_groups=EDGE_GROUPS,
+        table_dir=None,
+        transposition_size=1_000_000,
+        endgame=None,
+    ):
+        """
+        :param cube: A Cube, FaceletCube or anything with flat_str()
+        and sequence()
+        :param max_nodes: Give up after expanding this many nodes
+        :param timeout: Give up after this many seconds
+        :param corner_groups: Corners of each corner pattern database
+        :param edge_groups: Edges of each edge pattern database
+        :param table_dir: Directory of the persisted tables
+        :param transposition_size: Maximum number of states remembered
+        per iteration, to skip states reached again by another path
+        :param endgame: An EndgameTable which gives the exact distance of
+        the states within its depth
+        """
+        self.cube = cube
+        self.moves = []
+        self.max_nodes = max_nodes
+        self.timeout = timeout
+        self.corner_groups = corner_groups
+        self.edge_groups = edge_groups
+        self.table_dir = table_dir
+        self.transposition_size = transposition_size
+        self.endgame = endgame
+        self.nodes = 0
+
+    def solve(self):
+        """
+        Find an optimal solution, record it in moves as in Solver (a half
+        turn as two quarter turns) and apply it to the cube.
+
+        :raises InvalidCubeError: if the cube is not solvable
+        :raises SearchLimitError: if max_nodes or timeout is reached
+        """
+        cubie_cube = validate(self.cube.flat_str())
+        groups = piece_groups(self.corner_groups, self.edge_groups)
+        tables = load_tables(
+            self.table_dir, self.corner_groups, self.edge_groups
+        ).tables
+        search = _Search(groups, tables, self.transposition_size, self.endgame)
+        deadline = (
+            None if self.timeout is None else time.monotonic() + self.timeout
+        )
+        try:
+            solution = search.run(cubie_cube, self.max_nodes, deadline)
+        finally:
+            self.nodes = search.nodes
+        for move in solution:
+            self.moves.extend(move_tokens(move))
+        self.cube.sequence(" ".join(self.moves))
+
+
+class _Limit(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, groups, tables, transposition_size, endgame=None):
+        self.piece_groups = groups
+        self.groups = []
+        for i, group in enumerate(groups):
+            self.groups.append(
+                (
+                    group.n_orientations,
+                    memoryview(tables[f"{i}_position_move"].ravel()),
+                    memoryview(tables[f"{i}_orientation_change"].ravel()),
+                    memoryview(tables[f"{i}_orientation_add"].ravel()),
+                    memoryview(tables[f"{i}_prune"]),
+                )
+            )
+        self.transposition_size = transposition_size
+        self.endgame = endgame
+        self.nodes = 0
+
+    def run(self, cube, max_nodes, deadline):
+        """:return: An optimal solution as a list of indices of FACE_TURNS"""
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.moves = []
+        state = []
+        for group in self.piece_groups:
+            state.extend(divmod(group.coordinate(cube), group.n_orientations))
+        state = tuple(state)
+        key = None
+        bound = self._distance(state)
+        if bound == 0:
+            return self.moves
+        if self.endgame is not None:
+            key = state_key(cube)
+            solution = self.endgame.solution(key)
+            if solution is not None:
+                return solution
+            bound = max(bound, self.endgame.depth + 1)
+        while True:
+            self.seen = {}
+            try:
+                if self._search(state, key, 0, bound):
+                    return self.moves
+            except _Limit:
+                raise SearchLimitError(
+                    f"No solution found in {self.nodes} nodes, an optimal "
+                    f"solution has at least {bound} face turns",
+                    self.nodes,
+                    bound,
+                ) from None
+            bound += 1
+
+    def _distance(self, state):
+        distance = 0
+        for i, (n, *_, prune) in enumerate(self.groups):
+            d = prune[state[2 * i] * n + state[2 * i + 1]]
+            if d > distance:
+                distance = d
+        return distance
+
+    def _search(self, state, key, depth, bound):
+        """
+        :param key: The state_key of the state, None without endgame table
+        :return: True if a solution of at most bound face turns was found,
+        it is in self.moves
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _Limit()
+        if (
+            self.deadline is not None
+            and self.nodes % _CLOCK_INTERVAL == 0
+            and time.monotonic() > self.deadline
+        ):
+            raise _Limit()
+
+        moves = self.moves
+        togo = bound - depth
+        # the children are within the depth of the endgame table
+        near = key is not None and togo <= self.endgame.depth + 1
+        children = []
+        for m in NEXT_MOVES[moves[-1] if moves else START]:
+            new_state = []
+            distance = 0
+            for i, (n, position_move, change, add, prune) in enumerate(
+                self.groups
+            ):
+                position = state[2 * i]
+                orientation = state[2 * i + 1]
+                new_position = position_move[position * N_MOVES + m]
+                new_orientation = add[
+                    change[position * N_MOVES + m] * n + orientation
+                ]
+                d = prune[new_position * n + new_orientation]
+                if d >= togo:
+                    break
+                if d > distance:
+                    distance = d
+                new_state.append(new_position)
+                new_state.append(new_orientation)
+            else:
+                if distance == 0:
+                    moves.append(m)
+                    return True
+                if near:
+                    children.append(m)
+                    continue
+                moves.append(m)
+                new_state = tuple(new_state)
+                new_key = None if key is None else key.translate(KEY_MOVES[m])
+                if self._visit(new_state, depth + 1) and self._search(
+                    new_state, new_key, depth + 1, bound
+                ):
+                    return True
+                moves.pop()
+        return bool(children) and self._finish(key, children, togo - 1)
+
+    def _finish(self, key, children, togo):
+        """
+        Look the children of a state up in the endgame table at once. The
+        table holds every state within togo face turns, so children which
+        are not in it are too far from solved.
+
+        :param children: The moves to the children
+        :return: True if a child is solved in at most togo face turns, the
+        solution is in self.moves
+        """
+        keys = [key.translate(KEY_MOVES[m]) for m in children]
+        last_moves = self.endgame.last_moves(keys)
+        for m, child, last in zip(children, keys, last_moves):
+            if last < 0:
+                continue
+            solution = self.endgame.solution(child)
+            if len(solution) <= togo:
+                self.moves.append(m)
+                self.moves.extend(solution)
+                return True
+        return False
+
+    def _visit(self, state, depth):
+        """
+        :return: False if state was already searched in this iteration
+        after at most depth moves, so that it can be skipped
+        """
+        seen = self.seen
+        if seen.get(state, depth + 1) <= depth:
+            return False
+        if len(seen) < self.transposition_size or state in seen:
+            seen[state] = depth
+        return True
@@ -0,0 +1,141 @@
+"""Shorten recorded move sequences.
+
+optimize removes the whole cube rotations X, Y, Z by renaming the moves
+which follow them, optionally rewrites the slice moves M, E, S into face
+turns and then merges turns of the same layer. Turns of layers on the same
+axis commute, so they are merged across each other as well, e.g.
+"R L Ri" becomes "L" and "F B Bi Fi" cancels completely.
+
+The result is the same position up to a whole cube rotation, which
+is_equivalent checks by replaying both sequences.
+"""
+
+# Where every face goes with a clockwise whole cube rotation
+_ROTATIONS = {
+    "X": {"F": "U", "U": "B", "B": "D", "D": "F", "R": "R", "L": "L"},
+    "Y": {"F": "L", "L": "B", "B": "R", "R": "F", "U": "U", "D": "D"},
+    "Z": {"U": "R", "R": "D", "D": "L", "L": "U", "F": "F", "B": "B"},
+}
+
+# The slice moves turn in the direction of L, D and F
+_SLICES = {"M": "L", "E": "D", "S": "F"}
+_SLICE_OF_FACE = {
+    "L": "M",
+    "R": "Mi",
+    "D": "E",
+    "U": "Ei",
+    "F": "S",
+    "B": "Si",
+}
+
+# A slice move is the turn of the two outer layers and a whole cube
+# rotation, e.g. M = Li R Xi
+_SLICE_EXPANSIONS = {
+    "M": ("Li", "R", "Xi"),
+    "E": ("Di", "U", "Yi"),
+    "S": ("Fi", "B", "Z"),
+}
+
+# Layers of every axis in the order they are written out
+_AXES = ("RLM", "UDE", "FBS")
+_AXIS_OF_LAYER = {layer: axis for axis in _AXES for layer in axis}
+
+# Sequences of whole cube rotations reaching the 24 orientations
+ORIENTATIONS = tuple(
+    (up + " " + turn).strip()
+    for up in ("", "X", "X X", "Xi", "Z", "Zi")
+    for turn in ("", "Y", "Y Y", "Yi")
+)
+
+
+def _split(move):
+    """:return: The layer and the number of clockwise quarter turns"""
+    if move.endswith("i"):
+        return move[:-1], 3
+    return move, 1
+
+
+def _inverse(move):
+    layer, turns = _split(move)
+    return layer if turns == 3 else layer + "i"
+
+
+def _reoriented(moves, expand_slices):
+    """
+    Drop the whole cube rotations. frame maps the face a move is named
+    after to the face it turns on the cube before any rotation.
+    """
+    frame = {face: face for face in "UDLRFB"}
+    pending = list(moves)
+    pending.reverse()
+    while pending:
+        move = pending.pop()
+        layer, turns = _split(move)
+        if layer in _ROTATIONS:
+            rotation = _ROTATIONS[layer]
+            for _ in range(turns):
+                frame = {rotation[face]: frame[face] for face in frame}
+        elif layer in _SLICES:
+            if expand_slices:
+                expansion = _SLICE_EXPANSIONS[layer]
+                if turns == 3:
+                    expansion = [_inverse(m) for m in expansion]
+                pending.extend(reversed(expansion))
+                continue
+            slice_move = _SLICE_OF_FACE[frame[_SLICES[layer]]]
+            yield slice_move if turns == 1 else _inverse(slice_move)
+        else:
+            yield frame[layer] if turns == 1 else frame[layer] + "i"
+
+
+def _merged(moves):
+    """Merge turns of the same axis, blocks of moves on one axis are
+    stored as (axis, {layer: quarter turns})."""
+    blocks = []
+    for move in moves:
+        layer, turns = _split(move)
+        axis = _AXIS_OF_LAYER[layer]
+        if not blocks or blocks[-1][0] != axis:
+            blocks.append((axis, dict.fromkeys(axis, 0)))
+        counts = blocks[-1][1]
+        counts[layer] = (counts[layer] + turns) % 4
+        if not any(counts.values()):
+            blocks.pop()
+
+    result = []
+    for axis, counts in blocks:
+        for layer in axis:
+            result.extend(
+                {0: (), 1: (layer,), 2: (layer, layer), 3: (layer + "i",)}[
+                    counts[layer]
+                ]
+            )
+    return result
+
+
+def optimize(moves, expand_slices=False):
+    """
+    :param moves: A list of moves in the notation of Cube.sequence,
+    like Solver.moves
+    :param expand_slices: Rewrite M, E and S into turns of the outer layers
+    :return: An equivalent list of moves without X, Y and Z. Half turns
+    are written as two quarter turns.
+    """
+    return _merged(_reoriented(moves, expand_slices))
+
+
+def is_equivalent(cube, moves, optimized):
+    """
+    :return: True if applying optimized to cube gives the same position as
+    applying moves, up to a whole cube rotation. cube is not changed.
+    """
+    expected = type(cube)(cube)
+    expected.sequence(" ".join(moves))
+    expected = expected.flat_str()
+    for orientation in ORIENTATIONS:
+        actual = type(cube)(cube)
+        actual.sequence(" ".join(optimized))
+        actual.sequence(orientation)
+        if actual.flat_str() == expected:
+            return True
+    return False
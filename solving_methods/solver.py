@@ -1,18 +1,42 @@
+import time
+
 from constants import DOWN
 from constants import LEFT
 from constants import RIGHT, FRONT
 from constants import UP
 from game.point import Point
+from solving_methods.stats import CountingCube, SolverStats, StageStats
 from solving_methods.utilities import get_rotations_from_face
 
 DEBUG = False
 
+# The stages of Solver.solve and what DEBUG prints after them
+STAGES = (
+    ("cross", "Cross:\n"),
+    ("cross_corners", "Corners:\n"),
+    ("second_layer", "Second layer:\n"),
+    ("back_face_edges", "Last layer edges\n"),
+    ("last_layer_corners_position", "Last layer corners -- position\n"),
+    (
+        "last_layer_corners_orientation",
+        "Last layer corners -- orientation\n",
+    ),
+    ("last_layer_edges", "Solved\n"),
+)
+
 
 class Solver:
-    def __init__(self, cube):
+    def __init__(self, cube, hook=None):
+        """
+        :param cube: The cube to solve
+        :param hook: If given, called with the StageStats of every stage
+        of solve() as soon as the stage is done
+        """
         self.cube = cube
         self.colors = cube.colors()
         self.moves = []
+        self.hook = hook
+        self.stats = SolverStats()
 
         self.left_piece = self.cube.find_piece(self.cube.left_color())
         self.right_piece = self.cube.find_piece(self.cube.right_color())
@@ -22,27 +46,36 @@ class Solver:
     def solve(self):
         if DEBUG:
             print(self.cube)
-        self.cross()
-        if DEBUG:
-            print("Cross:\n", self.cube)
-        self.cross_corners()
-        if DEBUG:
-            print("Corners:\n", self.cube)
-        self.second_layer()
-        if DEBUG:
-            print("Second layer:\n", self.cube)
-        self.back_face_edges()
-        if DEBUG:
-            print("Last layer edges\n", self.cube)
-        self.last_layer_corners_position()
-        if DEBUG:
-            print("Last layer corners -- position\n", self.cube)
-        self.last_layer_corners_orientation()
-        if DEBUG:
-            print("Last layer corners -- orientation\n", self.cube)
-        self.last_layer_edges()
-        if DEBUG:
-            print("Solved\n", self.cube)
+        cube = self.cube
+        self.stats = SolverStats()
+        try:
+            for name, label in STAGES:
+                self.cube = CountingCube(cube)
+                self._run_stage(name)
+                if DEBUG:
+                    print(label, self.cube)
+        finally:
+            self.cube = cube
+
+    def _run_stage(self, name):
+        """Run a stage of solve() and record its StageStats."""
+        moves = len(self.moves)
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        try:
+            getattr(self, name)()
+        finally:
+            stats = StageStats(
+                name,
+                wall_time=time.perf_counter() - wall_time,
+                cpu_time=time.process_time() - cpu_time,
+                moves=len(self.moves) - moves,
+                sequence_calls=self.cube.sequence_calls,
+                piece_lookups=self.cube.piece_lookups,
+            )
+            self.stats.stages.append(stats)
+        if self.hook is not None:
+            self.hook(stats)
 
     def move(self, move_str):
         self.moves.extend(move_str.split())
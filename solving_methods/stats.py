@@ -0,0 +1,101 @@
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+
+@dataclass
+class StageStats:
+    """What a single stage of a solving method cost."""
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    moves: int = 0
+    sequence_calls: int = 0
+    piece_lookups: int = 0
+
+
+@dataclass
+class SolverStats:
+    stages: List[StageStats] = field(default_factory=list)
+
+    def __getitem__(self, name):
+        return next(s for s in self.stages if s.name == name)
+
+    @property
+    def wall_time(self):
+        return sum(s.wall_time for s in self.stages)
+
+    @property
+    def cpu_time(self):
+        return sum(s.cpu_time for s in self.stages)
+
+    @property
+    def moves(self):
+        return sum(s.moves for s in self.stages)
+
+    def as_dict(self):
+        return {s.name: asdict(s) for s in self.stages}
+
+
+class CountingCube:
+    """Wraps a cube and counts the calls of sequence and of the methods
+    looking up pieces. Everything else is passed through to the cube."""
+
+    def __init__(self, cube):
+        self.wrapped = cube
+        self.sequence_calls = 0
+        self.piece_lookups = 0
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def __str__(self):
+        return str(self.wrapped)
+
+    def __eq__(self, other):
+        if isinstance(other, CountingCube):
+            other = other.wrapped
+        return self.wrapped == other
+
+    def __hash__(self):
+        return hash(self.wrapped)
+
+    def sequence(self, move_str):
+        self.sequence_calls += 1
+        self.wrapped.sequence(move_str)
+
+    def __getitem__(self, *args):
+        self.piece_lookups += 1
+        return self.wrapped.__getitem__(*args)
+
+    def get_piece(self, x, y, z):
+        self.piece_lookups += 1
+        return self.wrapped.get_piece(x, y, z)
+
+    def find_piece(self, *colors):
+        self.piece_lookups += 1
+        return self.wrapped.find_piece(*colors)
+
+    def left_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.left_color()
+
+    def right_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.right_color()
+
+    def up_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.up_color()
+
+    def down_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.down_color()
+
+    def front_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.front_color()
+
+    def back_color(self):
+        self.piece_lookups += 1
+        return self.wrapped.back_color()
@@ -0,0 +1,246 @@
+"""Persisted, memory-mapped tables for table driven solving methods.
+
+All tables of a solving method are stored in one binary file:
+
+    magic       8 bytes  b"RUBIKTBL"
+    format      uint32   FORMAT_VERSION
+    size        uint32   length of the directory
+    checksum    uint32   crc32 of the directory
+    directory   JSON     version of the tables and for every table its
+                         name, dtype, shape, offset, size and crc32
+    tables      raw array data, every table aligned to ALIGNMENT bytes
+
+The file is opened with mmap, so the tables are paged in on first access
+and all processes using the same file share one physical copy.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MAGIC = b"RUBIKTBL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_HEADER = struct.Struct("<8sIII")
+
+
+class TableFormatError(ValueError):
+    pass
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _file_mode():
+    """:return: The mode of a new file, as open() would create it"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_tables(path, tables, version):
+    """
+    Write the numpy arrays in tables to path. The file is replaced
+    atomically, so concurrent readers never see a partial file. It gets
+    the mode of a file created by open(), so that other users sharing
+    the table directory can read it.
+
+    :param tables: A dict mapping table names to numpy arrays
+    :param version: Version of the tables, read_tables refuses files
+    of another version
+    """
+    path = Path(path)
+    tables = {name: np.ascontiguousarray(t) for name, t in tables.items()}
+    entries = []
+    offset = end = 0
+    for name, table in tables.items():
+        entries.append(
+            {
+                "name": name,
+                "dtype": table.dtype.str,
+                "shape": list(table.shape),
+                "offset": offset,
+                "nbytes": table.nbytes,
+                "crc32": zlib.crc32(table),
+            }
+        )
+        end = offset + table.nbytes
+        offset = _aligned(end)
+    directory = json.dumps({"version": version, "tables": entries}).encode()
+    start = _aligned(_HEADER.size + len(directory))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    len(directory),
+                    zlib.crc32(directory),
+                )
+            )
+            f.write(directory)
+            for entry, table in zip(entries, tables.values()):
+                f.seek(start + entry["offset"])
+                f.write(table.tobytes())
+            f.truncate(start + end)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp, _file_mode())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_tables(path, version=None, verify=True):
+    """
+    Memory-map the tables of a file written by write_tables.
+
+    :param version: If given, the version the tables must have
+    :param verify: Check the crc32 of every table, which pages in the
+    whole file
+    :return: A dict mapping table names to read-only numpy arrays
+    :raises TableFormatError: if the file is corrupt or of another
+    version
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise TableFormatError(f"Empty table file: {path}")
+
+    if len(buffer) < _HEADER.size:
+        raise TableFormatError(f"Truncated table file: {path}")
+    magic, format_version, size, checksum = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise TableFormatError(f"Not a table file: {path}")
+    if format_version != FORMAT_VERSION:
+        raise TableFormatError(
+            f"Table file format {format_version} is not supported: {path}"
+        )
+    start = _HEADER.size
+    end = start + size
+    directory = buffer[start:end]
+    if zlib.crc32(directory) != checksum:
+        raise TableFormatError(f"Corrupt table directory: {path}")
+    directory = json.loads(directory)
+    if version is not None and directory["version"] != version:
+        raise TableFormatError(
+            f"Tables have version {directory['version']}, "
+            f"expected {version}: {path}"
+        )
+
+    start = _aligned(end)
+    tables = {}
+    for entry in directory["tables"]:
+        offset = start + entry["offset"]
+        if offset + entry["nbytes"] > len(buffer):
+            raise TableFormatError(f"Truncated table file: {path}")
+        table = np.frombuffer(
+            buffer,
+            dtype=np.dtype(entry["dtype"]),
+            count=int(np.prod(entry["shape"])),
+            offset=offset,
+        ).reshape(entry["shape"])
+        if verify and zlib.crc32(table) != entry["crc32"]:
+            raise TableFormatError(
+                f"Checksum mismatch of table {entry['name']}: {path}"
+            )
+        tables[entry["name"]] = table
+    return tables
+
+
+@contextmanager
+def _locked(path):
+    """
+    Hold an exclusive lock on the file path, so that only one process at
+    a time generates the tables. Without fcntl there is no lock.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDONLY | os.O_CREAT, _file_mode())
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # closing the file releases the lock
+        os.close(fd)
+
+
+class TableStore:
+    """Tables which are generated once and then loaded from a file.
+
+    Nothing is read or generated before the first table is requested.
+    If the file is missing, of another version or corrupt, all tables
+    are generated and the file is (re)written. Only the header and the
+    directory are checked on load, so a table is paged in when it is
+    used, not before. Processes starting at the same time generate the
+    tables once: the others wait for the file on a lock file next to it.
+    """
+
+    def __init__(self, path, builders, version, verify=False):
+        """
+        :param path: The table file
+        :param builders: A dict mapping table names to functions, which
+        get a dict of the tables built so far and return a numpy array
+        :param version: Version of the builders, change it whenever the
+        tables change
+        :param verify: Also check the crc32 of every table on load, which
+        reads the whole file
+        """
+        self.path = Path(path)
+        self.builders = builders
+        self.version = version
+        self.verify = verify
+        self._tables = None
+
+    def _read(self):
+        """:return: The tables of the file, None if they must be built"""
+        try:
+            tables = read_tables(self.path, self.version, self.verify)
+            if set(tables) == set(self.builders):
+                return tables
+        except (OSError, TableFormatError):
+            pass
+        return None
+
+    def _load(self):
+        tables = self._read()
+        if tables is not None:
+            return tables
+        with _locked(self.path.with_name(self.path.name + ".lock")):
+            # another process may have written the file meanwhile
+            tables = self._read()
+            if tables is not None:
+                return tables
+            tables = {}
+            for name, build in self.builders.items():
+                tables[name] = build(tables)
+            write_tables(self.path, tables, self.version)
+        return read_tables(self.path, self.version, verify=False)
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._tables = self._load()
+        return self._tables
+
+    def __getitem__(self, name):
+        return self.tables[name]
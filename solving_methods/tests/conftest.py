@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture
+def twisted_cube_str(solved_cube_str):
+    """A solved cube with one corner twisted, which can not be solved"""
+    twisted = solved_cube_str[:8] + "F" + solved_cube_str[9:14] + "U"
+    return twisted + solved_cube_str[15:]
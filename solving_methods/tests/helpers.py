@@ -0,0 +1,11 @@
+def face_turns(moves):
+    """Count a half turn, recorded as two quarter turns, as one turn."""
+    count = 0
+    previous = None
+    for move in moves:
+        if move == previous:
+            previous = None
+            continue
+        count += 1
+        previous = move
+    return count
@@ -0,0 +1,60 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from solving_methods.batch import solve_many
+
+
+@pytest.fixture
+def cube_strs(cube_str, solved_cube_str):
+    # the UF edge flipped
+    unsolvable = solved_cube_str[:7] + "F" + solved_cube_str[8:13] + "U"
+    unsolvable += solved_cube_str[14:]
+    return [cube_str, unsolvable, solved_cube_str, cube_str]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_many_in_order(cube_strs, workers):
+    results = list(solve_many(cube_strs, workers=workers, chunksize=1))
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.ok for r in results] == [True, False, True, True]
+    assert results[1].error == "InvalidCubeError: An edge is flipped"
+    assert results[0].moves == results[3].moves
+    for result in results:
+        if result.ok:
+            cube = Cube(result.cube_str)
+            cube.sequence(" ".join(result.moves))
+            assert cube.is_solved()
+
+
+def test_solve_many_as_completed(cube_strs):
+    results = solve_many(
+        cube_strs,
+        workers=2,
+        chunksize=3,
+        ordered=False,
+        cube_type=FaceletCube,
+    )
+    assert sorted(r.index for r in results) == [0, 1, 2, 3]
+
+
+def test_solve_many_invalid_chunksize(cube_strs):
+    with pytest.raises(ValueError):
+        list(solve_many(cube_strs, chunksize=0))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_solve_many_streams_input(solved_cube_str, ordered):
+    read = []
+
+    def endless():
+        while True:
+            read.append(1)
+            yield solved_cube_str
+
+    results = solve_many(endless(), workers=2, chunksize=2, ordered=ordered)
+    for _ in range(6):
+        assert next(results).ok
+    # the 3 chunks yielded plus at most 2 * workers + 1 chunks in flight
+    assert len(read) <= 2 * (3 + 5)
+    results.close()
@@ -0,0 +1,68 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.validation import InvalidCubeError
+from solving_methods.bidirectional import BidirectionalSolver
+from solving_methods.optimal import SearchLimitError
+from solving_methods.solver import Solver
+from solving_methods.tests.helpers import face_turns
+
+
+def test_solved_cube(solved_cube):
+    solver = BidirectionalSolver(solved_cube)
+    solver.solve()
+    assert solver.moves == []
+    assert not solver.used_fallback
+
+
+@pytest.mark.parametrize(
+    "scramble, expected",
+    [
+        ("R", ["Ri"]),
+        ("U U", ["U", "U"]),
+        ("R U Fi", ["F", "Ui", "Ri"]),
+        ("U D", ["Di", "Ui"]),
+        ("R Ri L", ["Li"]),
+    ],
+)
+def test_solve_short_scrambles(solved_cube, scramble, expected):
+    solved_cube.sequence(scramble)
+    solver = BidirectionalSolver(solved_cube)
+    solver.solve()
+    assert solver.moves == expected
+    assert solver.cube.is_solved()
+
+
+@pytest.mark.parametrize("cube_type", [Cube, FaceletCube])
+def test_solve_is_optimal(solved_cube_str, cube_type):
+    # 7 face turns, none of them cancel
+    cube = cube_type(solved_cube_str)
+    cube.sequence("R U U Fi L D D Bi R R")
+    solver = BidirectionalSolver(cube)
+    solver.solve()
+    assert face_turns(solver.moves) == 7
+    assert cube.is_solved()
+
+
+def test_fallback(solved_cube):
+    solved_cube.sequence("R U Fi L")
+    solver = BidirectionalSolver(solved_cube, max_depth=3, fallback=Solver)
+    solver.solve()
+    assert solver.used_fallback
+    assert solver.moves
+    assert solved_cube.is_solved()
+
+
+def test_no_fallback(solved_cube):
+    solved_cube.sequence("R U Fi L")
+    solver = BidirectionalSolver(solved_cube, max_depth=3, fallback=None)
+    with pytest.raises(SearchLimitError) as error:
+        solver.solve()
+    assert error.value.lower_bound == 4
+    assert error.value.nodes == solver.nodes > 0
+
+
+def test_unsolvable_cube(twisted_cube_str):
+    with pytest.raises(InvalidCubeError):
+        BidirectionalSolver(Cube(twisted_cube_str)).solve()
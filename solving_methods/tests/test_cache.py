@@ -0,0 +1,78 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.symmetry import SYMMETRIES
+from solving_methods.cache import SolutionCache
+from solving_methods.solver import Solver
+
+
+class CountingSolver(Solver):
+    calls = 0
+
+    def solve(self):
+        CountingSolver.calls += 1
+        super().solve()
+
+
+@pytest.fixture
+def counting_solver():
+    CountingSolver.calls = 0
+    return CountingSolver
+
+
+def is_solution(cube_str, moves):
+    cube = Cube(cube_str)
+    cube.sequence(" ".join(moves))
+    return cube.is_solved()
+
+
+def test_solve_and_hit(cube_str, counting_solver):
+    cache = SolutionCache(counting_solver)
+    moves = cache.solve(cube_str)
+    assert is_solution(cube_str, moves)
+    assert cache.solve(FaceletCube(cube_str)) == moves
+    assert counting_solver.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("index", [3, 17, 30, 47])
+def test_symmetric_cube_is_hit(cube_str, counting_solver, index):
+    cache = SolutionCache(counting_solver)
+    cache.solve(cube_str)
+    symmetric = SYMMETRIES[index].apply(cube_str.encode()).decode()
+    symmetric = symmetric.translate(str.maketrans("UDLRFB", "WYOGRB"))
+    assert is_solution(symmetric, cache.solve(symmetric))
+    assert counting_solver.calls == 1
+
+
+def test_evict_by_entries(cube_str, solved_cube_str, counting_solver):
+    scrambled = Cube(solved_cube_str)
+    scrambled.sequence("R U F")
+    cache = SolutionCache(counting_solver, max_entries=1)
+    cache.solve(cube_str)
+    cache.solve(scrambled)
+    assert len(cache) == 1
+    cache.solve(cube_str)
+    assert counting_solver.calls == 3
+
+
+def test_evict_by_bytes(cube_str, solved_cube_str):
+    scrambled = Cube(solved_cube_str)
+    scrambled.sequence("R U F")
+    cache = SolutionCache(max_bytes=1000)
+    cache.solve(cube_str)
+    assert len(cache) == 1
+    cache.solve(scrambled)
+    assert len(cache) == 1
+    assert cache.nbytes <= 1000
+
+
+def test_sqlite_survives_restart(cube_str, tmp_path, counting_solver):
+    path = tmp_path / "solutions.sqlite"
+    with SolutionCache(counting_solver, path=path) as cache:
+        moves = cache.solve(cube_str)
+    with SolutionCache(counting_solver, path=path) as cache:
+        assert cache.solve(cube_str) == moves
+        assert cache.hits == 1
+    assert counting_solver.calls == 1
@@ -0,0 +1,268 @@
+from itertools import product
+
+import pytest
+
+from game.cubie_cube import CubieCube
+from solving_methods.coordinates import ALLOWED_NEXT
+from solving_methods.coordinates import FACE_TURNS
+from solving_methods.coordinates import HALF_TURN_MOVES
+from solving_methods.coordinates import KEY_MOVES
+from solving_methods.coordinates import M_SLICE_EDGES
+from solving_methods.coordinates import MOVE_CUBES
+from solving_methods.coordinates import NEXT_MOVES
+from solving_methods.coordinates import PHASE2_MOVES
+from solving_methods.coordinates import PieceGroup
+from solving_methods.coordinates import SOLVED_KEY
+from solving_methods.coordinates import START
+from solving_methods.coordinates import allowed
+from solving_methods.coordinates import canonical_sequences
+from solving_methods.coordinates import corner_coset_move_table
+from solving_methods.coordinates import corner_coset_table
+from solving_methods.coordinates import corner_permutation
+from solving_methods.coordinates import corner_permutation_move_table
+from solving_methods.coordinates import flip
+from solving_methods.coordinates import flip_move_table
+from solving_methods.coordinates import half_turn_corner_move_table
+from solving_methods.coordinates import half_turn_corner_permutations
+from solving_methods.coordinates import half_turn_corner_table
+from solving_methods.coordinates import inverse_move
+from solving_methods.coordinates import move_tokens
+from solving_methods.coordinates import next_moves
+from solving_methods.coordinates import pruning_table
+from solving_methods.coordinates import slice_coordinate
+from solving_methods.coordinates import slice_move_table
+from solving_methods.coordinates import slice_permutation
+from solving_methods.coordinates import slice_permutation_move_table
+from solving_methods.coordinates import slice_permutations
+from solving_methods.coordinates import slice_permutations_move_table
+from solving_methods.coordinates import state_key
+from solving_methods.coordinates import twist
+from solving_methods.coordinates import twist_move_table
+from solving_methods.coordinates import ud_edge_permutation
+from solving_methods.coordinates import ud_edge_permutation_move_table
+
+
+@pytest.fixture
+def scrambled():
+    cube = CubieCube()
+    cube.sequence("Di R L F Ri L U U F D D Ri L L F F D R R B B D D L L Ui")
+    return cube
+
+
+@pytest.fixture
+def scrambled_in_phase2():
+    cube = CubieCube()
+    cube.sequence("U R R D F F Ui B B L L D D R R Di F F U U L L")
+    return cube
+
+
+def test_move_tokens():
+    assert len(FACE_TURNS) == 18
+    assert move_tokens(0) == ("U",)
+    assert move_tokens(1) == ("U", "U")
+    assert move_tokens(2) == ("Ui",)
+    assert len(PHASE2_MOVES) == 10
+
+
+def test_next_moves():
+    assert len(NEXT_MOVES) == len(ALLOWED_NEXT) == 19
+    assert NEXT_MOVES[START] == tuple(range(18))
+    # no U after U, no U or D after D
+    assert NEXT_MOVES[0] == tuple(range(3, 18))
+    assert NEXT_MOVES[9] == tuple(range(3, 9)) + tuple(range(12, 18))
+    assert NEXT_MOVES[1][:3] == (3, 4, 5) and 9 in NEXT_MOVES[1]
+    for previous in range(18):
+        for m in range(18):
+            assert ALLOWED_NEXT[previous][m] == allowed(m, previous)
+    assert next_moves(PHASE2_MOVES)[START] == PHASE2_MOVES
+    assert next_moves(PHASE2_MOVES)[0] == (4, 7, 9, 10, 11, 13, 16)
+
+
+@pytest.mark.parametrize(
+    "length, count", [(0, 1), (1, 18), (2, 243), (3, 3240), (4, 43254)]
+)
+def test_canonical_sequences_count(length, count):
+    assert sum(1 for _ in canonical_sequences(length)) == count
+
+
+def test_canonical_sequences():
+    sequences = list(canonical_sequences(2))
+    assert sequences[0] == (0, 3)
+    assert len(set(sequences)) == len(sequences)
+    for first, second in sequences:
+        assert first // 3 != second // 3
+        # U D, but not D U
+        assert (first // 3, second // 3) != (3, 0)
+    assert (9, 0) not in sequences and (0, 9) in sequences
+    half_turns = list(canonical_sequences(3, HALF_TURN_MOVES))
+    assert half_turns == [
+        sequence
+        for sequence in product(HALF_TURN_MOVES, repeat=3)
+        if allowed(sequence[1], sequence[0])
+        and allowed(sequence[2], sequence[1])
+    ]
+
+
+def test_canonical_sequences_reach_all_states():
+    states = {SOLVED_KEY}
+    for length in range(1, 4):
+        for sequence in canonical_sequences(length):
+            key = SOLVED_KEY
+            for m in sequence:
+                key = key.translate(KEY_MOVES[m])
+            states.add(key)
+    assert len(states) == 1 + 18 + 243 + 3240
+
+
+def test_inverse_move():
+    assert [inverse_move(m) for m in range(3)] == [2, 1, 0]
+    assert inverse_move(16) == 16
+    for m, move in enumerate(MOVE_CUBES):
+        cube = move.multiply(MOVE_CUBES[inverse_move(m)])
+        assert state_key(cube) == SOLVED_KEY
+
+
+def test_state_key(scrambled):
+    assert state_key(CubieCube()) == SOLVED_KEY
+    assert len(SOLVED_KEY) == 20
+    assert state_key(scrambled) != SOLVED_KEY
+    for m, move in enumerate(MOVE_CUBES):
+        key = state_key(scrambled).translate(KEY_MOVES[m])
+        assert key == state_key(scrambled.multiply(move))
+
+
+def test_solved_coordinates():
+    cube = CubieCube()
+    for coordinate in (
+        twist,
+        flip,
+        slice_coordinate,
+        corner_permutation,
+        ud_edge_permutation,
+        slice_permutation,
+    ):
+        assert coordinate(cube) == 0
+
+
+@pytest.mark.parametrize(
+    "table, coordinate",
+    [
+        (twist_move_table, twist),
+        (flip_move_table, flip),
+        (slice_move_table, slice_coordinate),
+        (corner_permutation_move_table, corner_permutation),
+    ],
+)
+def test_move_table(table, coordinate, scrambled):
+    table = table()
+    for m, move in enumerate(MOVE_CUBES):
+        expected = coordinate(scrambled.multiply(move))
+        assert table[coordinate(scrambled), m] == expected
+
+
+@pytest.mark.parametrize(
+    "table, coordinate",
+    [
+        (ud_edge_permutation_move_table, ud_edge_permutation),
+        (slice_permutation_move_table, slice_permutation),
+    ],
+)
+def test_phase2_move_table(table, coordinate, scrambled_in_phase2):
+    assert slice_coordinate(scrambled_in_phase2) == 0
+    table = table()
+    for m in PHASE2_MOVES:
+        expected = coordinate(scrambled_in_phase2.multiply(MOVE_CUBES[m]))
+        assert table[coordinate(scrambled_in_phase2), m] == expected
+
+
+def test_slice_coordinate_of_other_edges(scrambled):
+    cube = CubieCube()
+    cube.sequence("R R")
+    assert slice_coordinate(cube) == 0
+    assert slice_coordinate(cube, M_SLICE_EDGES) != 0
+    table = slice_move_table()
+    for m, move in enumerate(MOVE_CUBES):
+        expected = slice_coordinate(scrambled.multiply(move), M_SLICE_EDGES)
+        coordinate = slice_coordinate(scrambled, M_SLICE_EDGES)
+        assert table[coordinate, m] == expected
+
+
+def test_corner_cosets(scrambled):
+    assert len(half_turn_corner_permutations()) == 96
+    cosets = corner_coset_table()
+    assert cosets.max() == 419
+    assert (cosets[half_turn_corner_permutations()] == 0).all()
+    table = corner_coset_move_table(cosets)
+    for cube in (scrambled, scrambled.inverse()):
+        for m, move in enumerate(MOVE_CUBES):
+            expected = cosets[corner_permutation(cube.multiply(move))]
+            assert table[cosets[corner_permutation(cube)], m] == expected
+
+
+def test_half_turn_move_tables():
+    cube = CubieCube()
+    cube.sequence("R R U U F F D D L L R R B B U U L L F F")
+    corners = half_turn_corner_table()
+    corner_table = half_turn_corner_move_table(corners)
+    edge_table = slice_permutations_move_table()
+    assert corners[0] == 0
+    assert slice_permutations(CubieCube()) == 0
+    for m in HALF_TURN_MOVES:
+        moved = cube.multiply(MOVE_CUBES[m])
+        corner = corners[corner_permutation(cube)]
+        assert corner_table[corner, m] == corners[corner_permutation(moved)]
+        edges = slice_permutations(cube)
+        assert edge_table[edges, m] == slice_permutations(moved)
+
+
+def test_pruning_table():
+    twist_table = twist_move_table()
+    slice_table = slice_move_table()
+    distances = pruning_table(twist_table, slice_table)
+    assert len(distances) == len(twist_table) * len(slice_table)
+    assert distances[0] == 0
+    assert distances.min() == 0
+    assert distances.max() == 9
+    cube = CubieCube()
+    cube.sequence("R")
+    assert (
+        distances[twist(cube) * len(slice_table) + slice_coordinate(cube)] == 1
+    )
+
+
+@pytest.mark.parametrize(
+    "kind, pieces",
+    [("corner", (0, 1, 2)), ("corner", (6, 2, 4, 0)), ("edge", (3, 7, 1))],
+)
+def test_piece_group_move_tables(kind, pieces, scrambled):
+    group = PieceGroup(kind, pieces)
+    position_move = group.position_move_table()
+    orientation_change = group.orientation_change_table()
+    orientation_add = group.orientation_add_table()
+    n = group.n_orientations
+    assert position_move.shape == (group.n_positions, len(FACE_TURNS))
+    assert 0 <= group.coordinate(scrambled) < len(group)
+    for m, move in enumerate(MOVE_CUBES):
+        position, orientation = divmod(group.coordinate(scrambled), n)
+        change = orientation_change[position, m]
+        expected = group.coordinate(scrambled.multiply(move))
+        assert (
+            position_move[position, m] * n
+            + orientation_add[change, orientation]
+            == expected
+        )
+
+
+def test_piece_group_pruning_table():
+    group = PieceGroup("corner", (0, 1, 2))
+    distances = group.pruning_table(
+        group.position_move_table(),
+        group.orientation_change_table(),
+        group.orientation_add_table(),
+    )
+    assert len(distances) == 8 * 7 * 6 * 27
+    assert distances.min() == 0
+    assert distances[group.coordinate(CubieCube())] == 0
+    cube = CubieCube()
+    cube.sequence("R U")
+    assert distances[group.coordinate(cube)] == 2
@@ -0,0 +1,104 @@
+import pytest
+
+from game.cube import Cube
+from game.cubie_cube import CubieCube
+from game.facelet_cube import FaceletCube
+from solving_methods.bidirectional import BidirectionalSolver
+from solving_methods.coordinates import SOLVED_KEY
+from solving_methods.coordinates import state_key
+from solving_methods.endgame import EndgameSolver
+from solving_methods.endgame import build_table
+from solving_methods.endgame import load_table
+from solving_methods.optimal import SearchLimitError
+
+# A small table, the default takes seconds to generate
+DEPTH = 3
+
+
+def key(scramble):
+    cube = CubieCube()
+    cube.sequence(scramble)
+    return state_key(cube)
+
+
+@pytest.fixture
+def table(table_dir):
+    return load_table(table_dir, DEPTH)
+
+
+@pytest.mark.parametrize("depth, size", [(0, 1), (1, 19), (2, 262)])
+def test_build_table(depth, size):
+    table = build_table(depth)
+    assert table.shape == (2, size)
+
+
+def test_load_table_persists(table, table_dir):
+    assert len(table) == 1 + 18 + 243 + 3240
+    assert load_table(table_dir, DEPTH) is table
+    assert (table_dir / "endgame-3.tbl").exists()
+
+
+def test_contains(table):
+    assert SOLVED_KEY in table
+    assert key("R U Fi") in table
+    assert key("R U Fi L") not in table
+
+
+def test_last_moves(table):
+    moves = table.last_moves([SOLVED_KEY, key("R"), key("R U L D")])
+    assert list(moves) == [31, 3, -1]
+    assert len(table.last_moves([])) == 0
+
+
+@pytest.mark.parametrize(
+    "scramble, expected",
+    [
+        ("", []),
+        ("R", [5]),
+        ("U U", [1]),
+        ("R U Fi", [6, 2, 5]),
+        ("R Ri L", [14]),
+    ],
+)
+def test_solution(table, scramble, expected):
+    assert table.solution(key(scramble)) == expected
+
+
+def test_solution_of_far_state(table):
+    assert table.solution(key("R U Fi L")) is None
+
+
+@pytest.mark.parametrize("cube_type", [Cube, FaceletCube])
+def test_solver(solved_cube_str, table_dir, cube_type):
+    cube = cube_type(solved_cube_str)
+    cube.sequence("R U U Fi")
+    solver = EndgameSolver(cube, depth=DEPTH, table_dir=table_dir)
+    solver.solve()
+    assert solver.moves == ["F", "U", "U", "Ri"]
+    assert cube.is_solved()
+
+
+def test_solver_out_of_range(solved_cube, table_dir):
+    solved_cube.sequence("R U Fi L")
+    solver = EndgameSolver(solved_cube, depth=DEPTH, table_dir=table_dir)
+    with pytest.raises(SearchLimitError) as error:
+        solver.solve()
+    assert error.value.lower_bound == DEPTH + 1
+
+
+def test_bidirectional_solver_with_table(solved_cube, table):
+    # 7 face turns, none of them cancel
+    solved_cube.sequence("R U U Fi L D D Bi R R")
+    solver = BidirectionalSolver(solved_cube, endgame=table, fallback=None)
+    solver.solve()
+    assert len(solver.moves) == 10
+    assert solved_cube.is_solved()
+
+
+def test_bidirectional_solver_limit(solved_cube, table):
+    solved_cube.sequence("R U Fi L")
+    solver = BidirectionalSolver(
+        solved_cube, max_depth=3, endgame=table, fallback=None
+    )
+    with pytest.raises(SearchLimitError):
+        solver.solve()
@@ -0,0 +1,122 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from solving_methods.bidirectional import BidirectionalSolver
+from solving_methods.endgame import load_table
+from solving_methods.optimal import OptimalSolver
+from solving_methods.optimal import SearchLimitError
+from solving_methods.optimal import load_tables
+from solving_methods.optimal import piece_groups
+from solving_methods.tests.helpers import face_turns
+
+# Small pattern databases, the defaults take minutes to generate
+CORNER_GROUPS = ((0, 1, 2, 3), (4, 5, 6))
+EDGE_GROUPS = ((0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11))
+
+
+@pytest.fixture
+def solver(table_dir):
+    def solver(cube, **kwargs):
+        return OptimalSolver(
+            cube,
+            corner_groups=CORNER_GROUPS,
+            edge_groups=EDGE_GROUPS,
+            table_dir=table_dir,
+            **kwargs,
+        )
+
+    return solver
+
+
+def test_piece_groups():
+    assert len(piece_groups()) == 3
+    with pytest.raises(ValueError):
+        piece_groups(((0, 1, 2),), EDGE_GROUPS)
+    with pytest.raises(ValueError):
+        piece_groups(CORNER_GROUPS, ((0, 1, 2, 3, 4, 5),))
+
+
+def test_load_tables_persists(table_dir):
+    store = load_tables(table_dir, CORNER_GROUPS, EDGE_GROUPS)
+    assert store["0_prune"].max() > 0
+    assert store.path.exists()
+    assert load_tables(table_dir, CORNER_GROUPS, EDGE_GROUPS) is store
+
+
+def test_solved_cube(solved_cube, solver):
+    method = solver(solved_cube)
+    method.solve()
+    assert method.moves == []
+
+
+@pytest.mark.parametrize(
+    "scramble, expected",
+    [
+        ("R", ["Ri"]),
+        ("U U", ["U", "U"]),
+        ("R U Fi", ["F", "Ui", "Ri"]),
+        ("U U R", ["Ri", "U", "U"]),
+    ],
+)
+def test_solve_short_scrambles(solved_cube, solver, scramble, expected):
+    solved_cube.sequence(scramble)
+    method = solver(solved_cube)
+    method.solve()
+    assert method.moves == expected
+    assert method.cube.is_solved()
+
+
+@pytest.mark.parametrize(
+    "scramble, distance",
+    [
+        ("F Ri D D B Li U Fi R", 8),
+        ("L Di B B U R Fi", 6),
+        ("U Fi Li D R B B", 6),
+        # R U Ri solves it, Ui U and F Fi cancel
+        ("R U Ri Ui U F Fi", 3),
+    ],
+)
+def test_solve_is_optimal(solved_cube_str, solver, scramble, distance):
+    cube = FaceletCube(solved_cube_str)
+    cube.sequence(scramble)
+    # the distance found by an independent exact search
+    exact = BidirectionalSolver(FaceletCube(cube.flat_str()), fallback=None)
+    exact.solve()
+    assert face_turns(exact.moves) == distance
+    method = solver(cube)
+    method.solve()
+    assert method.cube.is_solved()
+    assert face_turns(method.moves) == distance
+    assert method.nodes > 0
+
+
+@pytest.mark.parametrize(
+    "scramble", ["F Ri D D B Li U Fi R", "R U Ri Ui U F Fi", "R"]
+)
+def test_endgame_table_saves_nodes(
+    solved_cube_str, solver, table_dir, scramble
+):
+    without = solver(FaceletCube(solved_cube_str))
+    without.cube.sequence(scramble)
+    without.solve()
+    cube = FaceletCube(solved_cube_str)
+    cube.sequence(scramble)
+    method = solver(cube, endgame=load_table(table_dir, depth=3))
+    method.solve()
+    assert cube.is_solved()
+    assert face_turns(method.moves) == face_turns(without.moves)
+    assert method.nodes < without.nodes
+
+
+def test_node_limit(solved_cube, solver):
+    solved_cube.sequence("F Ri D D B Li U Fi R")
+    with pytest.raises(SearchLimitError) as error:
+        solver(solved_cube, max_nodes=10).solve()
+    assert error.value.nodes == 11
+    assert error.value.lower_bound >= 1
+
+
+def test_unsolvable_cube(twisted_cube_str, solver):
+    with pytest.raises(ValueError):
+        solver(Cube(twisted_cube_str)).solve()
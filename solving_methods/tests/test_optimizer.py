@@ -0,0 +1,68 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from solving_methods.optimizer import is_equivalent
+from solving_methods.optimizer import optimize
+from solving_methods.solver import Solver
+
+
+@pytest.mark.parametrize(
+    "moves, expected",
+    [
+        ("", []),
+        ("F F F", ["Fi"]),
+        ("B Bi", []),
+        ("R Ri Ri", ["Ri"]),
+        ("X X U Xi Xi", ["D"]),
+        ("Z R Zi", ["U"]),
+        ("Y F Yi", ["R"]),
+        ("F B Fi", ["B"]),
+        ("U D Ui Di R", ["R"]),
+        ("R L Ri Li L", ["L"]),
+        ("Ui Di U D", []),
+        ("R U Ui Ri", []),
+        ("X M Xi", ["M"]),
+        ("Y M Yi", ["S"]),
+        ("F F", ["F", "F"]),
+    ],
+)
+def test_optimize(moves, expected):
+    assert optimize(moves.split()) == expected
+
+
+@pytest.mark.parametrize(
+    "moves, expected",
+    [
+        ("M", ["R", "Li"]),
+        ("Ei", ["Ui", "D"]),
+        ("S U", ["Fi", "B", "L"]),
+        ("M M", ["R", "R", "L", "L"]),
+    ],
+)
+def test_optimize_expand_slices(moves, expected):
+    assert optimize(moves.split(), expand_slices=True) == expected
+
+
+@pytest.mark.parametrize("expand_slices", [False, True])
+def test_optimize_solver_moves(cube_str, expand_slices):
+    solver = Solver(FaceletCube(cube_str))
+    solver.solve()
+    optimized = optimize(solver.moves, expand_slices)
+    assert len(optimized) < len(solver.moves)
+    assert not {"X", "Xi", "Y", "Yi", "Z", "Zi"} & set(optimized)
+    if expand_slices:
+        assert not {"M", "Mi", "E", "Ei", "S", "Si"} & set(optimized)
+    assert is_equivalent(Cube(cube_str), solver.moves, optimized)
+
+    cube = Cube(cube_str)
+    cube.sequence(" ".join(optimized))
+    assert cube.is_solved()
+
+
+def test_is_equivalent(cube):
+    before = cube.flat_str()
+    assert is_equivalent(cube, ["R", "X"], ["R"])
+    assert is_equivalent(cube, ["M"], ["R", "Li"])
+    assert not is_equivalent(cube, ["R"], ["L"])
+    assert cube.flat_str() == before
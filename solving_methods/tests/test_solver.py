@@ -3,8 +3,10 @@ from operator import itemgetter
 import numpy as np
 import pytest
 
+from game.cube import Cube
 from game.piece import Piece
 from game.point import Point
+from solving_methods.solver import STAGES
 from solving_methods.solver import Solver
 
 
@@ -216,3 +218,35 @@ def test_integration_test_solve_parametrized_cube(cube1, original_scramble, requ
         solver.solve()
         assert solver.cube.is_solved()
         print(len(solver.moves))
+
+
+def test_solve_stats(cube):
+    reported = []
+    solver = Solver(cube, hook=reported.append)
+    solver.solve()
+    assert solver.cube is cube
+    names = [name for name, _ in STAGES]
+    assert [s.name for s in solver.stats.stages] == names
+    assert reported == solver.stats.stages
+    assert solver.stats.moves == len(solver.moves)
+    assert solver.stats["cross"].moves > 0
+    assert solver.stats["cross"].sequence_calls > 0
+    assert solver.stats["cross"].piece_lookups > 0
+    assert all(s.wall_time >= 0 and s.cpu_time >= 0 for s in reported)
+    assert set(solver.stats.as_dict()) == {name for name, _ in STAGES}
+
+
+def test_solve_tracks_misplaced_pieces(cube, monkeypatch):
+    calls = []
+    track_solved = Cube._track_solved
+
+    def counted(self):
+        calls.append(self)
+        track_solved(self)
+
+    monkeypatch.setattr(Cube, "_track_solved", counted)
+    solver = Solver(cube)
+    solver.solve()
+    assert cube.is_solved()
+    # found once at the first is_solved, then kept up to date by the moves
+    assert len(calls) == 1
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import stat
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+
+from solving_methods.table_store import TableFormatError
+from solving_methods.table_store import TableStore
+from solving_methods.table_store import read_tables
+from solving_methods.table_store import write_tables
+
+
+def _build_slowly(log, _):
+    with open(log, "a") as f:
+        f.write("built\n")
+    time.sleep(0.5)
+    return np.arange(10)
+
+
+def _load_store(path, log):
+    store = TableStore(path, {"table": partial(_build_slowly, log)}, "v1")
+    assert store["table"].sum() == 45
+
+
+@pytest.fixture
+def tables():
+    return {
+        "moves": np.arange(36, dtype=np.int32).reshape(12, 3),
+        "prune": np.array([0, 1, 2, 1, 3], dtype=np.int8),
+    }
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "test.tbl"
+
+
+def test_round_trip(path, tables):
+    write_tables(path, tables, "v1")
+    loaded = read_tables(path, "v1")
+    assert set(loaded) == set(tables)
+    for name, table in tables.items():
+        assert loaded[name].dtype == table.dtype
+        np.testing.assert_array_equal(loaded[name], table)
+    assert not loaded["moves"].flags.writeable
+
+
+def test_file_mode(path, tables):
+    umask = os.umask(0o022)
+    try:
+        write_tables(path, tables, "v1")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_version_mismatch(path, tables):
+    write_tables(path, tables, "v1")
+    with pytest.raises(TableFormatError):
+        read_tables(path, "v2")
+
+
+@pytest.mark.parametrize("position", [0, -1])
+def test_corrupt_file(path, tables, position):
+    write_tables(path, tables, "v1")
+    data = bytearray(path.read_bytes())
+    data[position] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(TableFormatError):
+        read_tables(path, "v1")
+
+
+def test_store_builds_lazily_once(path, tables):
+    calls = []
+
+    def build(name):
+        def builder(built):
+            calls.append(name)
+            if name == "prune":
+                assert "moves" in built
+            return tables[name]
+
+        return builder
+
+    builders = {name: build(name) for name in tables}
+    store = TableStore(path, builders, "v1")
+    assert calls == [] and not path.exists()
+    np.testing.assert_array_equal(store["prune"], tables["prune"])
+    assert calls == ["moves", "prune"]
+    store["moves"]
+    assert calls == ["moves", "prune"]
+
+    store = TableStore(path, builders, "v1")
+    np.testing.assert_array_equal(store["moves"], tables["moves"])
+    assert calls == ["moves", "prune"]
+
+
+def test_store_rebuilds_other_version(path, tables):
+    write_tables(path, {"prune": tables["prune"][:2]}, "v1")
+    store = TableStore(path, {"prune": lambda _: tables["prune"]}, "v2")
+    np.testing.assert_array_equal(store["prune"], tables["prune"])
+    assert read_tables(path)["prune"].shape == (5,)
+
+
+def test_store_verifies_on_request(path, tables):
+    write_tables(path, tables, "v1")
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    builders = {name: lambda _, t=t: t for name, t in tables.items()}
+    store = TableStore(path, builders, "v1")
+    assert store["prune"][-1] != tables["prune"][-1]
+    store = TableStore(path, builders, "v1", verify=True)
+    np.testing.assert_array_equal(store["prune"], tables["prune"])
+    assert read_tables(path, "v1")["prune"][-1] == tables["prune"][-1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_store_builds_once_across_processes(path, tmp_path):
+    log = tmp_path / "builds.log"
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_load_store, args=(path, log)) for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [p.exitcode for p in processes] == [0, 0, 0]
+    assert log.read_text() == "built\n"
@@ -0,0 +1,65 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.scramble import scrambles
+from game.validation import InvalidCubeError
+from solving_methods.thistlethwaite import ThistlethwaiteSolver
+from solving_methods.thistlethwaite import load_tables
+from solving_methods.tests.helpers import face_turns
+
+
+def test_load_tables_persists(table_dir):
+    store = load_tables(table_dir)
+    assert store["half_turn_prune"].max() == 15
+    assert store["coset_slice_prune"].max() == 13
+    assert store["twist_slice_prune"].max() == 10
+    assert store["flip_prune"].max() == 7
+    assert store.path.stat().st_size < 8 << 20
+    assert load_tables(table_dir) is store
+
+
+def test_solved_cube(solved_cube, table_dir):
+    solver = ThistlethwaiteSolver(solved_cube, table_dir=table_dir)
+    solver.solve()
+    assert solver.moves == []
+    assert solver.phase_lengths == [0, 0, 0, 0]
+
+
+@pytest.mark.parametrize(
+    "scramble, expected",
+    [
+        ("R", ["Ri"]),
+        ("F", ["Fi"]),
+        ("U U", ["U", "U"]),
+        ("F R", ["Ri", "Fi"]),
+    ],
+)
+def test_solve_short_scrambles(solved_cube, table_dir, scramble, expected):
+    solved_cube.sequence(scramble)
+    solver = ThistlethwaiteSolver(solved_cube, table_dir=table_dir)
+    solver.solve()
+    assert solver.moves == expected
+    assert solver.cube.is_solved()
+
+
+@pytest.mark.parametrize("cube_type", [Cube, FaceletCube])
+def test_solve_scrambles(cube_type, table_dir):
+    for cube_str in scrambles(20, seed=3):
+        cube = cube_type(cube_str)
+        solver = ThistlethwaiteSolver(cube, table_dir=table_dir)
+        solver.solve()
+        assert cube.is_solved()
+        assert not {"X", "Y", "Z"} & {m.rstrip("i") for m in solver.moves}
+        assert face_turns(solver.moves) <= 45
+        assert all(
+            length <= limit
+            for length, limit in zip(solver.phase_lengths, (7, 10, 13, 15))
+        )
+
+
+def test_unsolvable_cube(twisted_cube_str, table_dir):
+    with pytest.raises(InvalidCubeError):
+        ThistlethwaiteSolver(
+            Cube(twisted_cube_str), table_dir=table_dir
+        ).solve()
@@ -0,0 +1,85 @@
+import pytest
+
+from game.cube import Cube
+from game.facelet_cube import FaceletCube
+from game.validation import InvalidCubeError
+from solving_methods import two_phase
+from solving_methods.two_phase import TABLE_FILE
+from solving_methods.two_phase import TwoPhaseSolver
+from solving_methods.two_phase import load_tables
+from solving_methods.tests.helpers import face_turns
+
+
+def test_load_tables_persists(table_dir):
+    store = load_tables(table_dir)
+    assert store["twist_slice_prune"][0] == 0
+    assert (table_dir / TABLE_FILE).exists()
+    assert load_tables(table_dir) is store
+
+
+def test_solved_cube(solved_cube, table_dir):
+    solver = TwoPhaseSolver(solved_cube, table_dir=table_dir)
+    solver.solve()
+    assert solver.moves == []
+    assert solver.cube.is_solved()
+
+
+def test_solve(cube, table_dir):
+    original = Cube(cube)
+    solver = TwoPhaseSolver(cube, max_length=22, table_dir=table_dir)
+    solver.solve()
+    assert solver.cube.is_solved()
+    assert face_turns(solver.moves) <= 22
+    original.sequence(" ".join(solver.moves))
+    assert original.is_solved()
+
+
+@pytest.mark.parametrize(
+    "scramble",
+    [
+        "Ui F B Ri U Ri Fi D D L R Ui F F L L Ui D L L Ui B B Ui",
+        "F Ui F F Di B L L F D D B U U B B U U L B R F F Ui L R R",
+        "Ri U B U U R R Fi Ri Fi Ui L L U F F Ui Di Fi L L D D",
+    ],
+)
+def test_solve_scrambles(scramble, solved_cube_str, table_dir):
+    cube = FaceletCube(solved_cube_str)
+    cube.sequence(scramble)
+    solver = TwoPhaseSolver(cube, max_length=22, table_dir=table_dir)
+    solver.solve()
+    assert solver.cube.is_solved()
+    assert face_turns(solver.moves) <= 22
+    assert not {"X", "Xi", "Y", "Yi", "Z", "Zi"} & set(solver.moves)
+
+
+def test_max_length(solved_cube, table_dir):
+    solved_cube.sequence("R U Fi")
+    solver = TwoPhaseSolver(solved_cube, max_length=3, table_dir=table_dir)
+    solver.solve()
+    assert solver.moves == ["F", "Ui", "Ri"]
+
+
+def test_timeout_stops_search(cube, table_dir, monkeypatch):
+    # the time is up at once, the search stops at the first node after
+    # finding a solution
+    monkeypatch.setattr(two_phase, "_CLOCK_INTERVAL", 1)
+    found = []
+    start_phase2 = two_phase._Search._start_phase2
+
+    def record(search):
+        start_phase2(search)
+        if search.best is not None and not found:
+            found.append(search.nodes)
+
+    monkeypatch.setattr(two_phase._Search, "_start_phase2", record)
+    solver = TwoPhaseSolver(cube, max_length=0, timeout=0, table_dir=table_dir)
+    search = two_phase._Search(load_tables(table_dir).tables)
+    monkeypatch.setattr(two_phase, "_Search", lambda tables: search)
+    solver.solve()
+    assert cube.is_solved()
+    assert search.nodes == found[0] + 1
+
+
+def test_unsolvable_cube(twisted_cube_str, table_dir):
+    with pytest.raises(InvalidCubeError):
+        TwoPhaseSolver(Cube(twisted_cube_str), table_dir=table_dir).solve()
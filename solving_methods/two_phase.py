@@ -0,0 +1,257 @@
+"""Kociemba's two-phase algorithm.
+
+Phase 1 brings the cube into the subgroup G1 = <U, D, R2, L2, F2, B2>,
+where all corner and edge orientations are solved and the UD slice edges
+are in the UD slice. Phase 2 solves the cube using only moves of G1.
+Both phases are iterative deepening searches guided by pruning tables.
+Longer phase 1 solutions are tried until the total length is good enough
+or the time budget is used up.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from game.validation import validate
+from solving_methods.table_store import TableStore
+from solving_methods.coordinates import (
+    MOVE_CUBES,
+    N_MOVES,
+    N_SLICE,
+    N_SLICE_PERMUTATION,
+    NEXT_MOVES,
+    PHASE2_MOVES,
+    START,
+    corner_permutation,
+    corner_permutation_move_table,
+    flip,
+    flip_move_table,
+    move_tokens,
+    pruning_table,
+    slice_coordinate,
+    slice_move_table,
+    slice_permutation,
+    slice_permutation_move_table,
+    next_moves,
+    twist,
+    twist_move_table,
+    ud_edge_permutation,
+    ud_edge_permutation_move_table,
+)
+
+DEFAULT_TABLE_DIR = Path(
+    os.environ.get("RUBIKS_TABLE_DIR", Path(__file__).parent / "tables")
+)
+TABLE_FILE = "two_phase.tbl"
+TABLE_VERSION = "two-phase-1"
+
+# Nodes between two checks of the time limit
+_CLOCK_INTERVAL = 1024
+
+
+def _pruning(a, b, moves):
+    return lambda tables: pruning_table(tables[a], tables[b], moves)
+
+
+_BUILDERS = {
+    "twist_move": lambda _: twist_move_table(),
+    "flip_move": lambda _: flip_move_table(),
+    "slice_move": lambda _: slice_move_table(),
+    "corner_permutation_move": lambda _: corner_permutation_move_table(),
+    "ud_edge_permutation_move": lambda _: ud_edge_permutation_move_table(),
+    "slice_permutation_move": lambda _: slice_permutation_move_table(),
+    "twist_slice_prune": _pruning("twist_move", "slice_move", range(N_MOVES)),
+    "flip_slice_prune": _pruning("flip_move", "slice_move", range(N_MOVES)),
+    "corner_slice_prune": _pruning(
+        "corner_permutation_move", "slice_permutation_move", PHASE2_MOVES
+    ),
+    "edge_slice_prune": _pruning(
+        "ud_edge_permutation_move", "slice_permutation_move", PHASE2_MOVES
+    ),
+}
+
+# The phase 2 moves which may follow a move
+_PHASE2_NEXT = next_moves(PHASE2_MOVES)
+
+_stores = {}
+
+
+def load_tables(table_dir=None):
+    """
+    The move and pruning tables are generated on first use and stored in
+    table_dir, later calls (also in other processes) memory-map them.
+
+    :return: A TableStore with the tables
+    """
+    table_dir = Path(table_dir or DEFAULT_TABLE_DIR)
+    if table_dir not in _stores:
+        _stores[table_dir] = TableStore(
+            table_dir / TABLE_FILE, _BUILDERS, TABLE_VERSION
+        )
+    return _stores[table_dir]
+
+
+class TwoPhaseSolver:
+    def __init__(self, cube, max_length=21, timeout=3.0, table_dir=None):
+        """
+        :param cube: A Cube, FaceletCube or anything with flat_str()
+        and sequence()
+        :param max_length: Stop searching as soon as a solution with at
+        most max_length face turns is found. Half turns count as one face
+        turn, but are recorded as two quarter turns in moves.
+        :param timeout: Time budget in seconds after which the shortest
+        solution found so far is used. Both phases check it, but not
+        before a first solution is found.
+        :param table_dir: Directory of the persisted tables
+        """
+        self.cube = cube
+        self.moves = []
+        self.max_length = max_length
+        self.timeout = timeout
+        self.table_dir = table_dir
+
+    def solve(self):
+        cubie_cube = validate(self.cube.flat_str())
+
+        solution = _Search(load_tables(self.table_dir).tables).run(
+            cubie_cube, self.max_length, time.monotonic() + self.timeout
+        )
+        for move in solution:
+            self.moves.extend(move_tokens(move))
+        self.cube.sequence(" ".join(self.moves))
+
+
+class _Search:
+    def __init__(self, tables):
+        tables = {name: table.ravel() for name, table in tables.items()}
+        self.twist_move = memoryview(tables["twist_move"])
+        self.flip_move = memoryview(tables["flip_move"])
+        self.slice_move = memoryview(tables["slice_move"])
+        self.corner_move = memoryview(tables["corner_permutation_move"])
+        self.edge_move = memoryview(tables["ud_edge_permutation_move"])
+        self.slice_permutation_move = memoryview(
+            tables["slice_permutation_move"]
+        )
+        self.twist_slice_prune = memoryview(tables["twist_slice_prune"])
+        self.flip_slice_prune = memoryview(tables["flip_slice_prune"])
+        self.corner_slice_prune = memoryview(tables["corner_slice_prune"])
+        self.edge_slice_prune = memoryview(tables["edge_slice_prune"])
+
+    def run(self, cube, max_length, deadline):
+        self.cube = cube
+        self.max_length = max_length
+        self.deadline = deadline
+        self.best = None
+        self.done = False
+        self.nodes = 0
+        self.phase1_moves = []
+        twist_, flip_, slice_ = twist(cube), flip(cube), slice_coordinate(cube)
+        depth = self._phase1_distance(twist_, flip_, slice_)
+        while not self.done:
+            self._phase1(twist_, flip_, slice_, depth)
+            depth += 1
+            if self.best is not None and depth >= len(self.best):
+                break
+        return self.best
+
+    def _phase1_distance(self, twist_, flip_, slice_):
+        return max(
+            self.twist_slice_prune[twist_ * N_SLICE + slice_],
+            self.flip_slice_prune[flip_ * N_SLICE + slice_],
+        )
+
+    def _out_of_time(self):
+        """
+        Count a node and every _CLOCK_INTERVAL nodes check whether the
+        time is up. The search only stops once it has a solution.
+        """
+        self.nodes += 1
+        if (
+            self.nodes % _CLOCK_INTERVAL == 0
+            and self.best is not None
+            and time.monotonic() > self.deadline
+        ):
+            self.done = True
+        return self.done
+
+    def _phase1(self, twist_, flip_, slice_, togo):
+        if self._out_of_time():
+            return
+        moves = self.phase1_moves
+        if togo == 0:
+            # a phase 1 solution ending with a phase 2 move was already
+            # tried with a shorter phase 1
+            if not moves or moves[-1] not in PHASE2_MOVES:
+                self._start_phase2()
+            return
+        for m in NEXT_MOVES[moves[-1] if moves else START]:
+            new_twist = self.twist_move[twist_ * N_MOVES + m]
+            new_flip = self.flip_move[flip_ * N_MOVES + m]
+            new_slice = self.slice_move[slice_ * N_MOVES + m]
+            if self._phase1_distance(new_twist, new_flip, new_slice) >= togo:
+                continue
+            moves.append(m)
+            self._phase1(new_twist, new_flip, new_slice, togo - 1)
+            moves.pop()
+            if self.done:
+                return
+
+    def _start_phase2(self):
+        if time.monotonic() > self.deadline and self.best is not None:
+            self.done = True
+            return
+        limit = 30 if self.best is None else len(self.best) - 1
+        limit -= len(self.phase1_moves)
+        if limit < 0:
+            return
+
+        cube = self.cube
+        for m in self.phase1_moves:
+            cube = cube.multiply(MOVE_CUBES[m])
+        corners = corner_permutation(cube)
+        edges = ud_edge_permutation(cube)
+        slice_ = slice_permutation(cube)
+
+        distance = self._phase2_distance(corners, edges, slice_)
+        self.phase2_moves = []
+        for depth in range(distance, limit + 1):
+            if self._phase2(corners, edges, slice_, depth):
+                self.best = self.phase1_moves + self.phase2_moves
+                if len(self.best) <= self.max_length:
+                    self.done = True
+                return
+            if self.done:
+                return
+
+    def _phase2_distance(self, corners, edges, slice_):
+        return max(
+            self.corner_slice_prune[corners * N_SLICE_PERMUTATION + slice_],
+            self.edge_slice_prune[edges * N_SLICE_PERMUTATION + slice_],
+        )
+
+    def _phase2(self, corners, edges, slice_, togo):
+        if self._out_of_time():
+            return False
+        if togo == 0:
+            return corners == 0 and edges == 0 and slice_ == 0
+        moves = self.phase2_moves
+        if moves:
+            previous = moves[-1]
+        elif self.phase1_moves:
+            previous = self.phase1_moves[-1]
+        else:
+            previous = START
+        for m in _PHASE2_NEXT[previous]:
+            new_corners = self.corner_move[corners * N_MOVES + m]
+            new_edges = self.edge_move[edges * N_MOVES + m]
+            new_slice = self.slice_permutation_move[slice_ * N_MOVES + m]
+            distance = self._phase2_distance(new_corners, new_edges, new_slice)
+            if distance >= togo:
+                continue
+            moves.append(m)
+            if self._phase2(new_corners, new_edges, new_slice, togo - 1):
+                return True
+            moves.pop()
+            if self.done:
+                return False
+        return False